@@ -1,28 +1,141 @@
 from __future__ import annotations
 
+import os
+import threading
 from pathlib import Path
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy import Engine, create_engine, event, inspect, text
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-DB_PATH = BASE_DIR / "data" / "trades.db"
-DATABASE_URL = f"sqlite:///{DB_PATH}"
+DATA_DIR = BASE_DIR / "data"
+DB_PATH = DATA_DIR / "trades.db"
+# Names the database file currently being served. Written by snapshot rebuilds; when it
+# is absent the app serves DB_PATH.
+ACTIVE_DB_POINTER = DATA_DIR / "trades.current"
+
+# Bump whenever tables or indexes change so existing databases pick up the new schema.
+SCHEMA_VERSION = 4
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
-SessionLocal = sessionmaker(bind=engine)
+def _configure_sqlite(dbapi_connection, _connection_record) -> None:
+    # WAL lets page views keep reading while a background ingestion holds the write lock.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+def create_sqlite_engine(path: Path) -> Engine:
+    sqlite_engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(sqlite_engine, "connect", _configure_sqlite)
+    return sqlite_engine
+
+
+def resolve_db_path(pointer: Path = ACTIVE_DB_POINTER, default: Path = DB_PATH) -> Path:
+    try:
+        name = pointer.read_text().strip()
+    except FileNotFoundError:
+        return default
+    return pointer.parent / name if name else default
+
+
+def activate_database(path: Path, pointer: Path = ACTIVE_DB_POINTER) -> None:
+    """Atomically point the app at ``path``; running workers switch on their next session."""
+    staging = pointer.with_name(pointer.name + ".tmp")
+    staging.write_text(path.name)
+    os.replace(staging, pointer)
+
+
+class ActiveDatabase:
+    """Engine for whichever database file ``pointer`` names, reopened when it changes."""
+
+    def __init__(self, pointer: Path = ACTIVE_DB_POINTER, default: Path = DB_PATH) -> None:
+        self.pointer = pointer
+        self.default = default
+        self.path: Path | None = None
+        self._engine: Engine | None = None
+        self._pointer_mtime: int | None = None
+        self._lock = threading.Lock()
+
+    def _read_pointer_mtime(self) -> int | None:
+        try:
+            return self.pointer.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def engine(self) -> Engine:
+        pointer_mtime = self._read_pointer_mtime()
+        if self._engine is not None and pointer_mtime == self._pointer_mtime:
+            return self._engine
+        with self._lock:
+            path = resolve_db_path(self.pointer, self.default)
+            if self._engine is None or path != self.path:
+                previous = self._engine
+                self._engine = create_sqlite_engine(path)
+                self.path = path
+                if previous is not None:
+                    # Sessions already using the old file keep their connections until
+                    # they close; pooled idle connections are released now.
+                    previous.dispose()
+            self._pointer_mtime = pointer_mtime
+        return self._engine
+
+
+active_database = ActiveDatabase()
+_session_factory = sessionmaker()
+
+
+def get_engine() -> Engine:
+    return active_database.engine()
+
+
+def SessionLocal() -> Session:
+    return _session_factory(bind=get_engine())
+
+
+def get_schema_version(bind: Engine) -> int:
+    with bind.connect() as connection:
+        return connection.execute(text("PRAGMA user_version")).scalar() or 0
+
+
+def _add_missing_columns(bind: Engine) -> None:
+    """Add nullable columns introduced since the database was created; create_all skips them."""
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+
 
+def init_db(bind: Engine | None = None) -> bool:
+    """Create missing tables and indexes unless the database is already at ``SCHEMA_VERSION``.
 
-def init_db() -> None:
+    Returns ``True`` when the schema was (re)applied and ``False`` when it was already current.
+    """
     from app import models  # noqa: F401
 
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    Base.metadata.create_all(bind=engine)
+    if bind is None:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        bind = get_engine()
+    if get_schema_version(bind) == SCHEMA_VERSION:
+        return False
+    Base.metadata.create_all(bind=bind)
+    _add_missing_columns(bind)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+    with bind.begin() as connection:
+        connection.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+    return True
@@ -1,24 +1,72 @@
 from __future__ import annotations
 
-from datetime import date
+import asyncio
+import logging
+import os
+from datetime import date, datetime
+from functools import partial
 from pathlib import Path
 
-from fastapi import Depends, FastAPI, Query, Request
-from fastapi.responses import HTMLResponse
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.db import SessionLocal, init_db
-from app.models import IngestionLog, Metrics, Politician, Trade
-from app.schemas import MetaOut, PoliticianOut, TradeOut
+from app.db import DATA_DIR, SessionLocal, get_engine, init_db
+from app.models import IngestionLog, Metrics, OpenPosition, Politician, Trade
+from app.schemas import (
+    MetaOut,
+    OpenPositionOut,
+    PoliticianOut,
+    RollupOut,
+    TickerOut,
+    TradeOut,
+    TradePageOut,
+    YearSummaryOut,
+)
+from app.services.pipeline import INGESTION_LEADER_LOCK_PATH, INGESTION_LOCK_PATH, run_ingestion
+from app.services.rollups import count_ticker_politicians, query_rollups
+from app.services.scheduler import IngestionScheduler
+from app.services.trade_feed import trade_feed
+from app.services.trade_queries import (
+    PAGE_SIZE,
+    fetch_trade_page,
+    fetch_trades_since,
+    filter_created_after,
+    latest_trade_id,
+    trade_counts_by_year,
+)
+from app.warmup import enable_bytecode_cache, warmup
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Capitol Trades Tracker", description="US politician trade disclosures")
 
 BASE_DIR = Path(__file__).resolve().parent
 TEMPLATES = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+enable_bytecode_cache(TEMPLATES.env, DATA_DIR / "cache" / "jinja")
+
+# Optional in-process ingestion; disabled unless an interval is configured.
+INGESTION_INTERVAL_SECONDS = float(os.environ.get("INGESTION_INTERVAL_SECONDS", "0"))
+INGESTION_BATCH_SIZE = int(os.environ.get("INGESTION_BATCH_SIZE", "500"))
+SCHEDULER = (
+    IngestionScheduler(
+        INGESTION_INTERVAL_SECONDS,
+        INGESTION_LOCK_PATH,
+        INGESTION_LEADER_LOCK_PATH,
+        partial(run_ingestion, batch_size=INGESTION_BATCH_SIZE),
+    )
+    if INGESTION_INTERVAL_SECONDS > 0
+    else None
+)
+
+# The change feed checks the database for trades committed by other processes on this
+# interval; ingestion in this process wakes subscribers immediately.
+TRADE_FEED_POLL_SECONDS = float(os.environ.get("TRADE_FEED_POLL_SECONDS", "5"))
+TRADE_STREAM_KEEPALIVE_SECONDS = 15.0
 
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
 
@@ -26,6 +74,47 @@ app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="stat
 @app.on_event("startup")
 def startup() -> None:
     init_db()
+    app.state.startup_timings = warmup(TEMPLATES.env, get_engine())
+    if SCHEDULER is not None:
+        SCHEDULER.start()
+
+
+@app.on_event("startup")
+async def start_trade_feed() -> None:
+    trade_feed.bind(asyncio.get_running_loop(), await asyncio.to_thread(_latest_trade_id))
+    app.state.trade_feed_poller = asyncio.create_task(_poll_trade_feed())
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    if SCHEDULER is not None:
+        SCHEDULER.stop()
+
+
+@app.on_event("shutdown")
+async def stop_trade_feed() -> None:
+    poller = getattr(app.state, "trade_feed_poller", None)
+    if poller is not None:
+        poller.cancel()
+
+
+def _latest_trade_id() -> int:
+    with SessionLocal() as db:
+        return latest_trade_id(db)
+
+
+def _trades_since(since_id: int) -> list[TradeOut]:
+    with SessionLocal() as db:
+        return [TradeOut.model_validate(trade) for trade in fetch_trades_since(db, since_id)]
+
+
+async def _poll_trade_feed() -> None:
+    while True:
+        await asyncio.sleep(TRADE_FEED_POLL_SECONDS)
+        try:
+            trade_feed.publish(await asyncio.to_thread(_latest_trade_id))
+        except Exception:
+            logger.exception("Trade feed poll failed")
 
 
 @app.exception_handler(StarletteHTTPException)
@@ -99,12 +188,8 @@ def politician_detail(
     db: Session = Depends(get_db),
 ) -> HTMLResponse:
     politician = db.query(Politician).filter(Politician.id == politician_id).one()
-    trades = (
-        db.query(Trade)
-        .filter(Trade.politician_id == politician_id)
-        .order_by(Trade.trade_date.desc())
-        .all()
-    )
+    trades, next_cursor = fetch_trade_page(db, politician_id)
+    year_summaries = [YearSummaryOut(**row) for row in trade_counts_by_year(db, politician_id)]
     metrics = db.query(Metrics).filter(Metrics.politician_id == politician_id).one_or_none()
     return TEMPLATES.TemplateResponse(
         "politician.html",
@@ -112,6 +197,8 @@ def politician_detail(
             "request": request,
             "politician": politician,
             "trades": trades,
+            "next_cursor": next_cursor,
+            "year_summaries": year_summaries,
             "metrics": metrics,
         },
     )
@@ -133,9 +220,16 @@ def api_trades(
     limit: int = 100,
     offset: int = 0,
     sort: str | None = None,
+    since_id: int | None = None,
+    created_after: datetime | None = None,
     db: Session = Depends(get_db),
 ) -> list[TradeOut]:
     query = db.query(Trade)
+    if created_after:
+        # since_id breaks ties between trades committed with the same created_at.
+        query = filter_created_after(query, created_after, since_id)
+    elif since_id is not None:
+        query = query.filter(Trade.id > since_id)
     if politician_id:
         query = query.filter(Trade.politician_id == politician_id)
     if ticker:
@@ -153,25 +247,65 @@ def api_trades(
                 Politician.name.ilike(f"%{q}%"),
             )
         )
-    sort = (sort or "trade_date_desc").lower()
-    if sort == "trade_date_asc":
+    if not sort:
+        sort = "created_at_asc" if created_after else "id_asc" if since_id is not None else "trade_date_desc"
+    sort = sort.lower()
+    if sort == "created_at_asc":
+        query = query.order_by(Trade.created_at.asc(), Trade.id.asc())
+    elif sort == "id_asc":
+        query = query.order_by(Trade.id.asc())
+    elif sort == "trade_date_asc":
         query = query.order_by(Trade.trade_date.asc())
     else:
         query = query.order_by(Trade.trade_date.desc())
-    trades = query.all()
 
-    if sort in {"amount_asc", "amount_desc"}:
-        def amount_key(trade: Trade) -> int:
-            lower = trade.amount_range.split("-")[0]
-            digits = "".join(ch for ch in lower if ch.isdigit())
-            return int(digits or 0)
+    if sort not in {"amount_asc", "amount_desc"}:
+        trades = query.offset(offset).limit(limit).all()
+        return [TradeOut.model_validate(trade) for trade in trades]
+
+    trades = query.all()
 
-        trades.sort(key=amount_key, reverse=sort == "amount_desc")
+    def amount_key(trade: Trade) -> int:
+        lower = trade.amount_range.split("-")[0]
+        digits = "".join(ch for ch in lower if ch.isdigit())
+        return int(digits or 0)
 
+    trades.sort(key=amount_key, reverse=sort == "amount_desc")
     sliced = trades[offset : offset + limit]
     return [TradeOut.model_validate(trade) for trade in sliced]
 
 
+@app.get("/api/trades/stream")
+async def api_trades_stream(request: Request, since_id: int | None = None) -> StreamingResponse:
+    """Server-Sent Events feed of trades inserted after ``since_id`` (or ``Last-Event-ID``)."""
+    last_event_id = request.headers.get("last-event-id")
+    if since_id is None and last_event_id and last_event_id.isdigit():
+        since_id = int(last_event_id)
+    if since_id is None:
+        since_id = trade_feed.latest_id
+
+    async def events():
+        last_id = since_id
+        yield "retry: 5000\n\n"
+        while not await request.is_disconnected():
+            latest_id = await trade_feed.wait_for(last_id, TRADE_STREAM_KEEPALIVE_SECONDS)
+            if latest_id <= last_id:
+                yield ": keep-alive\n\n"
+                continue
+            trades = await asyncio.to_thread(_trades_since, last_id)
+            if not trades:
+                last_id = latest_id
+            for trade in trades:
+                last_id = trade.id
+                yield f"id: {trade.id}\nevent: trade\ndata: {trade.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/api/politicians", response_model=list[PoliticianOut])
 def api_politicians(
     sort: str | None = None,
@@ -186,6 +320,9 @@ def api_politicians(
     elif sort == "excess_return_1y":
         query = query.order_by(Metrics.excess_return_1y.desc().nullslast())
     results = query.all()
+    open_positions: dict[int, list[OpenPositionOut]] = {}
+    for position in db.query(OpenPosition).order_by(OpenPosition.politician_id, OpenPosition.ticker):
+        open_positions.setdefault(position.politician_id, []).append(OpenPositionOut.model_validate(position))
     response: list[PoliticianOut] = []
     for politician, metrics in results:
         response.append(
@@ -200,6 +337,10 @@ def api_politicians(
                 most_traded_tickers=metrics.most_traded_tickers,
                 excess_return_1y=metrics.excess_return_1y,
                 excess_return_5y=metrics.excess_return_5y,
+                realized_return=metrics.realized_return,
+                realized_excess_return=metrics.realized_excess_return,
+                closed_lot_count=metrics.closed_lot_count,
+                open_positions=open_positions.get(politician.id, []),
                 top_tickers=metrics.most_traded_tickers.split(", ")
                 if metrics.most_traded_tickers
                 else [],
@@ -209,6 +350,7 @@ def api_politicians(
                     "sell_count": metrics.sell_count,
                     "excess_return_1y": metrics.excess_return_1y,
                     "excess_return_5y": metrics.excess_return_5y,
+                    "realized_excess_return": metrics.realized_excess_return,
                 },
             )
         )
@@ -219,6 +361,12 @@ def api_politicians(
 def api_politician(politician_id: int, db: Session = Depends(get_db)) -> PoliticianOut:
     politician = db.query(Politician).filter(Politician.id == politician_id).one()
     metrics = db.query(Metrics).filter(Metrics.politician_id == politician_id).one_or_none()
+    open_positions = (
+        db.query(OpenPosition)
+        .filter(OpenPosition.politician_id == politician_id)
+        .order_by(OpenPosition.ticker)
+        .all()
+    )
     top_tickers: list[str] = []
     if metrics and metrics.most_traded_tickers:
         top_tickers = metrics.most_traded_tickers.split(", ")
@@ -233,6 +381,10 @@ def api_politician(politician_id: int, db: Session = Depends(get_db)) -> Politic
         most_traded_tickers=metrics.most_traded_tickers if metrics else None,
         excess_return_1y=metrics.excess_return_1y if metrics else None,
         excess_return_5y=metrics.excess_return_5y if metrics else None,
+        realized_return=metrics.realized_return if metrics else None,
+        realized_excess_return=metrics.realized_excess_return if metrics else None,
+        closed_lot_count=metrics.closed_lot_count if metrics else None,
+        open_positions=[OpenPositionOut.model_validate(position) for position in open_positions],
         top_tickers=top_tickers,
         metrics_summary={
             "trade_count": metrics.trade_count if metrics else None,
@@ -240,10 +392,79 @@ def api_politician(politician_id: int, db: Session = Depends(get_db)) -> Politic
             "sell_count": metrics.sell_count if metrics else None,
             "excess_return_1y": metrics.excess_return_1y if metrics else None,
             "excess_return_5y": metrics.excess_return_5y if metrics else None,
+            "realized_excess_return": metrics.realized_excess_return if metrics else None,
         },
     )
 
 
+@app.get("/api/politicians/{politician_id}/trades", response_model=TradePageOut)
+def api_politician_trades(
+    politician_id: int,
+    limit: int = PAGE_SIZE,
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+) -> TradePageOut:
+    try:
+        trades, next_cursor = fetch_trade_page(db, politician_id, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return TradePageOut(
+        items=[TradeOut.model_validate(trade) for trade in trades],
+        next_cursor=next_cursor,
+    )
+
+
+@app.get("/api/rollups", response_model=list[RollupOut])
+def api_rollups(
+    group_by: str | None = None,
+    ticker: str | None = None,
+    politician_id: int | None = None,
+    trade_type: str | None = Query(None, alias="type"),
+    period_from: str | None = None,
+    period_to: str | None = None,
+    sort: str | None = None,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+) -> list[RollupOut]:
+    try:
+        rows = query_rollups(
+            db,
+            group_by=group_by.split(",") if group_by else None,
+            ticker=ticker,
+            politician_id=politician_id,
+            trade_type=trade_type,
+            period_from=period_from,
+            period_to=period_to,
+            sort=sort,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return [RollupOut(**row) for row in rows]
+
+
+@app.get("/api/tickers/{ticker}", response_model=TickerOut)
+def api_ticker(ticker: str, db: Session = Depends(get_db)) -> TickerOut:
+    ticker = ticker.upper()
+    by_type = {
+        row["trade_type"]: row
+        for row in query_rollups(db, group_by=["trade_type"], ticker=ticker)
+    }
+    if not by_type:
+        raise HTTPException(status_code=404, detail="Ticker not found")
+    monthly = query_rollups(db, group_by=["period"], ticker=ticker, limit=10_000)
+    return TickerOut(
+        ticker=ticker,
+        trade_count=sum(row["trade_count"] for row in by_type.values()),
+        buy_count=by_type.get("BUY", {}).get("trade_count", 0),
+        sell_count=by_type.get("SELL", {}).get("trade_count", 0),
+        politician_count=count_ticker_politicians(db, ticker),
+        amount_low_total=sum(row["amount_low_total"] for row in by_type.values()),
+        amount_high_total=sum(row["amount_high_total"] for row in by_type.values()),
+        monthly=[RollupOut(**row) for row in monthly],
+    )
+
+
 @app.get("/api/meta", response_model=MetaOut)
 def api_meta(db: Session = Depends(get_db)) -> MetaOut:
     last_ingestion = db.query(IngestionLog).order_by(IngestionLog.run_at.desc()).first()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, Date, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
@@ -18,6 +18,7 @@ class Politician(Base):
 
     trades: Mapped[list[Trade]] = relationship("Trade", back_populates="politician")
     metrics: Mapped[Metrics | None] = relationship("Metrics", back_populates="politician", uselist=False)
+    open_positions: Mapped[list[OpenPosition]] = relationship("OpenPosition", back_populates="politician")
 
 
 class Trade(Base):
@@ -32,6 +33,7 @@ class Trade(Base):
             "source_url",
             name="uq_trade_dedup",
         ),
+        Index("ix_trades_politician_date_id", "politician_id", "trade_date", "id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -43,7 +45,8 @@ class Trade(Base):
     amount_range: Mapped[str] = mapped_column(String(50))
     source: Mapped[str] = mapped_column(String(50))
     source_url: Mapped[str] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    metrics_stale: Mapped[bool | None] = mapped_column(Boolean, default=False, index=True)
 
     politician: Mapped[Politician] = relationship("Politician", back_populates="trades")
 
@@ -59,11 +62,52 @@ class Metrics(Base):
     most_traded_tickers: Mapped[str] = mapped_column(String(200), default="")
     excess_return_1y: Mapped[float | None] = mapped_column(Float)
     excess_return_5y: Mapped[float | None] = mapped_column(Float)
+    realized_return: Mapped[float | None] = mapped_column(Float)
+    realized_excess_return: Mapped[float | None] = mapped_column(Float)
+    closed_lot_count: Mapped[int | None] = mapped_column(Integer, default=0)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     politician: Mapped[Politician] = relationship("Politician", back_populates="metrics")
 
 
+class OpenPosition(Base):
+    __tablename__ = "open_positions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    politician_id: Mapped[int] = mapped_column(ForeignKey("politicians.id"), index=True)
+    ticker: Mapped[str] = mapped_column(String(20))
+    amount: Mapped[float] = mapped_column(Float)
+    opened_on: Mapped[date] = mapped_column(Date)
+    lot_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    politician: Mapped[Politician] = relationship("Politician", back_populates="open_positions")
+
+
+class TradeRollup(Base):
+    __tablename__ = "trade_rollups"
+    __table_args__ = (
+        Index("ix_trade_rollups_ticker_period", "ticker", "period"),
+        Index("ix_trade_rollups_politician_period", "politician_id", "period"),
+    )
+
+    period: Mapped[str] = mapped_column(String(7), primary_key=True)
+    ticker: Mapped[str] = mapped_column(String(20), primary_key=True)
+    politician_id: Mapped[int] = mapped_column(ForeignKey("politicians.id"), primary_key=True)
+    trade_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    trade_count: Mapped[int] = mapped_column(Integer, default=0)
+    amount_low_total: Mapped[int] = mapped_column(Integer, default=0)
+    amount_high_total: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class Price(Base):
+    __tablename__ = "prices"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    ticker: Mapped[str] = mapped_column(String(20), primary_key=True)
+    price_date: Mapped[date] = mapped_column("date", Date, primary_key=True)
+    close: Mapped[float] = mapped_column(Float)
+
+
 class IngestionLog(Base):
     __tablename__ = "ingestion_logs"
 
@@ -19,6 +19,15 @@ class TradeOut(BaseModel):
     created_at: datetime
 
 
+class OpenPositionOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    ticker: str
+    amount: float
+    opened_on: date
+    lot_count: int
+
+
 class PoliticianOut(BaseModel):
     id: int
     name: str
@@ -30,6 +39,10 @@ class PoliticianOut(BaseModel):
     most_traded_tickers: str | None = None
     excess_return_1y: float | None = None
     excess_return_5y: float | None = None
+    realized_return: float | None = None
+    realized_excess_return: float | None = None
+    closed_lot_count: int | None = None
+    open_positions: list[OpenPositionOut] | None = None
     top_tickers: list[str] | None = None
     metrics_summary: dict[str, float | int | None] | None = None
 
@@ -37,3 +50,36 @@ class PoliticianOut(BaseModel):
 class MetaOut(BaseModel):
     last_ingestion_time: datetime | None
     number_of_trades: int
+
+
+class TradePageOut(BaseModel):
+    items: list[TradeOut]
+    next_cursor: str | None = None
+
+
+class YearSummaryOut(BaseModel):
+    year: int
+    trade_count: int
+    buy_count: int
+    sell_count: int
+
+
+class RollupOut(BaseModel):
+    period: str | None = None
+    ticker: str | None = None
+    politician_id: int | None = None
+    trade_type: str | None = None
+    trade_count: int
+    amount_low_total: int
+    amount_high_total: int
+
+
+class TickerOut(BaseModel):
+    ticker: str
+    trade_count: int
+    buy_count: int
+    sell_count: int
+    politician_count: int
+    amount_low_total: int
+    amount_high_total: int
+    monthly: list[RollupOut]
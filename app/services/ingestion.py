@@ -1,23 +1,37 @@
 from __future__ import annotations
 
-from dataclasses import asdict
-from datetime import datetime
+import sys
+from datetime import date, datetime
+from functools import lru_cache
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.models import IngestionLog, Politician, Trade
+from app.models import IngestionLog, Politician, Trade, TradeRollup
 from app.services.metrics import refresh_metrics
+from app.services.rollups import apply_trades_to_rollups, rebuild_rollups
 from app.services.prices.base import PriceProvider
 from app.services.sources.base import RawTrade, TradeSource
+from app.services.trade_feed import trade_feed
+
+TradeKey = tuple[int, date, str, str, str, str]
+
+
+@lru_cache(maxsize=4096)
+def _normalize_symbol(value: str) -> str:
+    return sys.intern(value.upper())
 
 
 def normalize_trade(raw: RawTrade, source: TradeSource) -> dict:
-    payload = asdict(raw)
-    payload["trade_type"] = payload["trade_type"].upper()
-    payload["ticker"] = payload["ticker"].upper()
-    payload["source"] = source.source_name
-    return payload
+    return {
+        "trade_date": raw.trade_date,
+        "ticker": _normalize_symbol(raw.ticker),
+        "asset_name": raw.asset_name,
+        "trade_type": _normalize_symbol(raw.trade_type),
+        "amount_range": raw.amount_range,
+        "source": source.source_name,
+        "source_url": raw.source_url,
+    }
 
 
 def _get_or_create_politician(session: Session, raw: RawTrade) -> Politician:
@@ -29,27 +43,74 @@ def _get_or_create_politician(session: Session, raw: RawTrade) -> Politician:
     return politician
 
 
+def _commit_batch(session: Session, trades: list[Trade]) -> bool:
+    try:
+        # Rollup lookups autoflush the batch, so a conflicting insert can surface here.
+        apply_trades_to_rollups(session, trades)
+        session.flush()
+        latest_id = max((trade.id for trade in trades), default=0)
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        return False
+    trade_feed.publish(latest_id)
+    return True
+
+
+def _settle_batch(
+    session: Session,
+    pending: dict[TradeKey, Trade],
+    existing_keys: set[TradeKey],
+    politicians: dict[str, Politician],
+) -> int:
+    """Commit ``pending`` and return how many trades it stored.
+
+    A rolled-back batch forgets its keys so a later copy of the same trade can still be
+    inserted, and drops the politician cache because the rollback expired those rows.
+    """
+    if _commit_batch(session, list(pending.values())):
+        return len(pending)
+    existing_keys.difference_update(pending)
+    politicians.clear()
+    return 0
+
+
 def ingest_trades(
     session: Session,
     sources: list[TradeSource],
     price_provider: PriceProvider,
+    metrics_workers: int | None = None,
+    batch_size: int | None = None,
 ) -> int:
+    """Insert new trades, update rollups, and refresh metrics.
+
+    With ``batch_size`` set, trades and metrics are committed in batches of that size so
+    SQLite write locks are held briefly while the web app keeps serving reads.
+    """
     added = 0
-    existing_keys = {
-        (
-            trade.politician_id,
-            trade.trade_date,
-            trade.ticker,
-            trade.trade_type,
-            trade.amount_range,
-            trade.source_url,
+    pending: dict[TradeKey, Trade] = {}
+    politicians: dict[str, Politician] = {}
+    existing_keys: set[TradeKey] = {
+        tuple(row)
+        for row in session.query(
+            Trade.politician_id,
+            Trade.trade_date,
+            Trade.ticker,
+            Trade.trade_type,
+            Trade.amount_range,
+            Trade.source_url,
         )
-        for trade in session.query(Trade).all()
     }
+    if existing_keys and session.query(TradeRollup).first() is None:
+        rebuild_rollups(session)
+        session.commit()
     for source in sources:
         raw_trades = source.fetch_trades()
         for raw in raw_trades:
-            politician = _get_or_create_politician(session, raw)
+            politician = politicians.get(raw.politician)
+            if politician is None:
+                politician = _get_or_create_politician(session, raw)
+                politicians[raw.politician] = politician
             normalized = normalize_trade(raw, source)
             trade_key = (
                 politician.id,
@@ -61,24 +122,15 @@ def ingest_trades(
             )
             if trade_key in existing_keys:
                 continue
-            trade = Trade(
-                politician_id=politician.id,
-                trade_date=normalized["trade_date"],
-                ticker=normalized["ticker"],
-                asset_name=normalized.get("asset_name"),
-                trade_type=normalized["trade_type"],
-                amount_range=normalized["amount_range"],
-                source=normalized["source"],
-                source_url=normalized["source_url"],
-            )
+            trade = Trade(politician_id=politician.id, **normalized)
             session.add(trade)
+            pending[trade_key] = trade
             existing_keys.add(trade_key)
-            added += 1
-    try:
-        session.commit()
-    except IntegrityError:
-        session.rollback()
-    refresh_metrics(session, price_provider)
+            if batch_size and len(pending) >= batch_size:
+                added += _settle_batch(session, pending, existing_keys, politicians)
+                pending = {}
+    added += _settle_batch(session, pending, existing_keys, politicians)
+    refresh_metrics(session, price_provider, workers=metrics_workers, batch_size=batch_size)
     session.add(IngestionLog(trades_added=added, run_at=datetime.utcnow()))
     session.commit()
     return added
@@ -1,14 +1,30 @@
 from __future__ import annotations
 
+import multiprocessing
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, timedelta, datetime
+from typing import NamedTuple, Sequence
 
 from sqlalchemy.orm import Session
 
-from app.models import Metrics, Politician, Trade
+from app.db import get_engine
+from app.models import Metrics, OpenPosition, Politician, Trade
+from app.services.positions import PositionSummary, load_position_trades, reconstruct_positions
 from app.services.prices.base import PriceProvider
 
 
+class TradeRow(NamedTuple):
+    trade_date: date
+    ticker: str
+    trade_type: str
+
+
+MetricsResult = tuple[int, int, int, int, str, float | None, float | None]
+
+_worker_price_provider: PriceProvider | None = None
+
+
 def _average(values: list[float]) -> float | None:
     if not values:
         return None
@@ -26,7 +42,7 @@ def _calculate_return(price_provider: PriceProvider, ticker: str, start: date, e
 
 
 def compute_excess_returns(
-    trades: list[Trade],
+    trades: Sequence[Trade | TradeRow],
     price_provider: PriceProvider,
     window_days: int,
 ) -> float | None:
@@ -49,36 +65,197 @@ def compute_excess_returns(
     return avg_return - avg_spy
 
 
-def refresh_metrics(session: Session, price_provider: PriceProvider) -> None:
-    politicians = session.query(Politician).all()
-    for politician in politicians:
-        trades = (
-            session.query(Trade)
-            .filter(Trade.politician_id == politician.id)
-            .order_by(Trade.trade_date.desc())
-            .all()
-        )
-        trade_count = len(trades)
-        buy_count = sum(1 for trade in trades if trade.trade_type == "BUY")
-        sell_count = sum(1 for trade in trades if trade.trade_type == "SELL")
-        ticker_counts = Counter(trade.ticker for trade in trades)
-        most_traded = ", ".join([ticker for ticker, _ in ticker_counts.most_common(3)])
-        excess_return_1y = compute_excess_returns(trades, price_provider, 365)
-        excess_return_5y = compute_excess_returns(trades, price_provider, 365 * 5)
-
-        metrics = (
-            session.query(Metrics)
-            .filter(Metrics.politician_id == politician.id)
-            .one_or_none()
-        )
+def compute_politician_metrics(
+    politician_id: int,
+    trades: Sequence[TradeRow],
+    price_provider: PriceProvider,
+) -> MetricsResult:
+    buy_count = sum(1 for trade in trades if trade.trade_type == "BUY")
+    sell_count = sum(1 for trade in trades if trade.trade_type == "SELL")
+    ticker_counts = Counter(trade.ticker for trade in trades)
+    most_traded = ", ".join([ticker for ticker, _ in ticker_counts.most_common(3)])
+    return (
+        politician_id,
+        len(trades),
+        buy_count,
+        sell_count,
+        most_traded,
+        compute_excess_returns(trades, price_provider, 365),
+        compute_excess_returns(trades, price_provider, 365 * 5),
+    )
+
+
+def _init_worker(price_provider: PriceProvider) -> None:
+    global _worker_price_provider
+    # A forked worker inherits the parent's pooled SQLite connections; drop them unclosed
+    # so the child never reuses a connection the parent is still using.
+    get_engine().dispose(close=False)
+    _worker_price_provider = price_provider
+
+
+def _compute_shard(shard: list[tuple[int, list[TradeRow]]]) -> list[MetricsResult]:
+    assert _worker_price_provider is not None
+    return [
+        compute_politician_metrics(politician_id, trades, _worker_price_provider)
+        for politician_id, trades in shard
+    ]
+
+
+def _load_trades_by_politician(
+    session: Session,
+    politician_ids: set[int] | None = None,
+) -> list[tuple[int, list[TradeRow]]]:
+    politician_query = session.query(Politician.id).order_by(Politician.id)
+    trade_query = session.query(Trade.politician_id, Trade.trade_date, Trade.ticker, Trade.trade_type)
+    if politician_ids is not None:
+        politician_query = politician_query.filter(Politician.id.in_(politician_ids))
+        trade_query = trade_query.filter(Trade.politician_id.in_(politician_ids))
+    trades_by_politician: dict[int, list[TradeRow]] = {
+        politician_id: [] for (politician_id,) in politician_query.all()
+    }
+    rows = trade_query.order_by(Trade.politician_id, Trade.trade_date.desc(), Trade.id.desc()).all()
+    for politician_id, trade_date, ticker, trade_type in rows:
+        trades_by_politician.setdefault(politician_id, []).append(TradeRow(trade_date, ticker, trade_type))
+    return list(trades_by_politician.items())
+
+
+def _price_windows(groups: list[tuple[int, list[TradeRow]]]) -> dict[str, tuple[date, date]]:
+    """Date range each ticker (and SPY) needs priced to cover every return window."""
+    windows: dict[str, tuple[date, date]] = {}
+    for _, trades in groups:
+        for trade in trades:
+            end = trade.trade_date + timedelta(days=365 * 5)
+            for ticker in (trade.ticker, "SPY"):
+                start, stop = windows.get(ticker, (trade.trade_date, end))
+                windows[ticker] = (min(start, trade.trade_date), max(stop, end))
+    return windows
+
+
+def _compute_parallel(
+    groups: list[tuple[int, list[TradeRow]]],
+    price_provider: PriceProvider,
+    workers: int,
+) -> list[MetricsResult]:
+    # Workers get ``for_worker()``: SqlitePriceProvider passes only its database path and
+    # each worker reads the prices table over its own connection. Other providers are
+    # inherited from the parent's memory under fork and pickled, i.e. copied into every
+    # worker, on platforms that only support spawn.
+    price_provider.preload()
+    worker_provider = price_provider.for_worker()
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    groups = sorted(groups, key=lambda group: len(group[1]), reverse=True)
+    shard_count = min(len(groups), workers * 4)
+    shards = [groups[index::shard_count] for index in range(shard_count)]
+    results: list[MetricsResult] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(worker_provider,),
+    ) as executor:
+        for shard_results in executor.map(_compute_shard, shards):
+            results.extend(shard_results)
+    return results
+
+
+def _write_metrics(
+    session: Session,
+    results: list[MetricsResult],
+    positions: dict[int, PositionSummary],
+    batch_size: int | None = None,
+) -> None:
+    existing = {metrics.politician_id: metrics for metrics in session.query(Metrics).all()}
+    now = datetime.utcnow()
+    for written, result in enumerate(results, 1):
+        politician_id, trade_count, buy_count, sell_count, most_traded, excess_1y, excess_5y = result
+        metrics = existing.get(politician_id)
         if metrics is None:
-            metrics = Metrics(politician_id=politician.id)
+            metrics = Metrics(politician_id=politician_id)
             session.add(metrics)
         metrics.trade_count = trade_count
         metrics.buy_count = buy_count
         metrics.sell_count = sell_count
         metrics.most_traded_tickers = most_traded
-        metrics.excess_return_1y = excess_return_1y
-        metrics.excess_return_5y = excess_return_5y
-        metrics.updated_at = datetime.utcnow()
+        metrics.excess_return_1y = excess_1y
+        metrics.excess_return_5y = excess_5y
+        summary = positions.get(politician_id) or PositionSummary()
+        metrics.realized_return = summary.realized_return
+        metrics.realized_excess_return = summary.realized_excess_return
+        metrics.closed_lot_count = summary.closed_lot_count
+        metrics.updated_at = now
+        if batch_size and written % batch_size == 0:
+            session.commit()
+
+
+def _write_open_positions(
+    session: Session,
+    positions: dict[int, PositionSummary],
+    politician_ids: set[int] | None = None,
+) -> None:
+    query = session.query(OpenPosition)
+    if politician_ids is not None:
+        query = query.filter(OpenPosition.politician_id.in_(politician_ids))
+    query.delete(synchronize_session=False)
+    session.add_all(
+        OpenPosition(
+            politician_id=politician_id,
+            ticker=position.ticker,
+            amount=position.amount,
+            opened_on=position.opened_on,
+            lot_count=position.lot_count,
+        )
+        for politician_id, summary in positions.items()
+        for position in summary.open_positions
+    )
+
+
+def refresh_metrics(
+    session: Session,
+    price_provider: PriceProvider,
+    workers: int | None = None,
+    batch_size: int | None = None,
+    politician_ids: set[int] | None = None,
+) -> None:
+    """Recompute metrics and FIFO open positions for every politician.
+
+    With ``workers`` greater than one, politicians are sharded across a process pool;
+    results are identical to the serial path. Metrics, open positions, and the cleared
+    ``metrics_stale`` flags are committed together in one transaction, so readers never
+    see new metrics beside old positions. ``batch_size`` trades that for smaller commits
+    of the metrics rows. ``politician_ids`` limits the run to those politicians.
+    """
+    groups = _load_trades_by_politician(session, politician_ids)
+    price_provider.prefetch(_price_windows(groups))
+    if workers is not None and workers > 1 and len(groups) > 1:
+        results = _compute_parallel(groups, price_provider, workers)
+    else:
+        results = [
+            compute_politician_metrics(politician_id, trades, price_provider)
+            for politician_id, trades in groups
+        ]
+    positions = reconstruct_positions(load_position_trades(session, politician_ids), price_provider)
+    _write_metrics(session, results, positions, batch_size)
+    _write_open_positions(session, positions, politician_ids)
+    stale = session.query(Trade).filter(Trade.metrics_stale.is_(True))
+    if politician_ids is not None:
+        stale = stale.filter(Trade.politician_id.in_(politician_ids))
+    stale.update({Trade.metrics_stale: False}, synchronize_session=False)
     session.commit()
+
+
+def refresh_stale_metrics(
+    session: Session,
+    price_provider: PriceProvider,
+    workers: int | None = None,
+) -> int:
+    """Recompute metrics only for politicians with trades flagged by a price load."""
+    politician_ids = {
+        politician_id
+        for (politician_id,) in session.query(Trade.politician_id)
+        .filter(Trade.metrics_stale.is_(True))
+        .distinct()
+    }
+    if politician_ids:
+        refresh_metrics(session, price_provider, workers=workers, politician_ids=politician_ids)
+    return len(politician_ids)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.db import ACTIVE_DB_POINTER, DATA_DIR, SessionLocal, activate_database, init_db, resolve_db_path
+from app.services.ingestion import ingest_trades
+from app.services.metrics import refresh_stale_metrics
+from app.services.prices.base import PriceProvider
+from app.services.prices.loader import load_prices, read_price_csv, seed_prices
+from app.services.prices.sqlite_prices import SqlitePriceProvider
+from app.services.snapshots import build_snapshot, prune_snapshots, snapshot_path
+from app.services.sources.base import TradeSource
+from app.services.sources.provider_stub import ProviderStub
+from app.services.sources.sample_json_source import SampleJsonSource
+
+INGESTION_LOCK_PATH = DATA_DIR / "ingestion.lock"
+# Held for a web worker's lifetime by whichever worker runs scheduled ingestion.
+INGESTION_LEADER_LOCK_PATH = DATA_DIR / "ingestion-leader.lock"
+SAMPLE_PRICES_CSV = DATA_DIR / "sample_prices.csv"
+
+
+def build_sources() -> list[TradeSource]:
+    return [
+        SampleJsonSource(DATA_DIR / "sample_trades.json"),
+        ProviderStub(),
+    ]
+
+
+def build_price_provider() -> PriceProvider:
+    return SqlitePriceProvider(SessionLocal)
+
+
+def run_ingestion(metrics_workers: int | None = None, batch_size: int | None = None) -> int:
+    init_db()
+    session = SessionLocal()
+    try:
+        seed_prices(session, read_price_csv(SAMPLE_PRICES_CSV))
+        return ingest_trades(
+            session,
+            build_sources(),
+            build_price_provider(),
+            metrics_workers=metrics_workers,
+            batch_size=batch_size,
+        )
+    finally:
+        session.close()
+
+
+def rebuild_database(metrics_workers: int | None = None) -> int:
+    """Rebuild the live database into a fresh file with new trades, then swap it in atomically.
+
+    Existing trades keep their ids and ``created_at``; returns the number of new trades.
+    """
+    init_db()
+    previous = resolve_db_path()
+    target = snapshot_path(DATA_DIR)
+    try:
+        added = build_snapshot(
+            target,
+            build_sources(),
+            read_price_csv(SAMPLE_PRICES_CSV),
+            metrics_workers,
+            live_db=previous,
+        )
+    except BaseException:
+        target.unlink(missing_ok=True)
+        raise
+    activate_database(target, ACTIVE_DB_POINTER)
+    prune_snapshots(DATA_DIR, keep=[target, previous])
+    return added
+
+
+def run_price_load(csv_path: Path, metrics_workers: int | None = None) -> tuple[int, int]:
+    """Upsert closes from ``csv_path`` and refresh metrics for politicians they affect.
+
+    Returns the number of price rows written and politicians recomputed.
+    """
+    init_db()
+    session = SessionLocal()
+    try:
+        written = load_prices(session, read_price_csv(csv_path))
+        refreshed = refresh_stale_metrics(session, build_price_provider(), workers=metrics_workers)
+        return written, refreshed
+    finally:
+        session.close()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterable, NamedTuple
+
+from sqlalchemy.orm import Session
+
+from app.models import Trade
+from app.services.prices.base import PriceProvider
+from app.services.rollups import parse_amount_range
+
+
+class PositionTrade(NamedTuple):
+    politician_id: int
+    trade_date: date
+    ticker: str
+    trade_type: str
+    amount_range: str
+
+
+@dataclass(slots=True)
+class Lot:
+    amount: float
+    opened_on: date
+    price: float | None
+
+
+@dataclass(slots=True)
+class OpenLotSummary:
+    ticker: str
+    amount: float
+    opened_on: date
+    lot_count: int
+
+
+@dataclass(slots=True)
+class PositionSummary:
+    closed_lot_count: int = 0
+    matched_amount: float = 0.0
+    weighted_return: float = 0.0
+    weighted_spy_return: float = 0.0
+    open_positions: list[OpenLotSummary] = field(default_factory=list)
+
+    @property
+    def realized_return(self) -> float | None:
+        if not self.matched_amount:
+            return None
+        return self.weighted_return / self.matched_amount
+
+    @property
+    def realized_excess_return(self) -> float | None:
+        if not self.matched_amount:
+            return None
+        return (self.weighted_return - self.weighted_spy_return) / self.matched_amount
+
+
+def amount_midpoint(amount_range: str) -> float:
+    low, high = parse_amount_range(amount_range)
+    return (low + high) / 2
+
+
+def _period_return(start_price: float | None, end_price: float | None) -> float | None:
+    if start_price is None or end_price is None or start_price == 0:
+        return None
+    return (end_price - start_price) / start_price
+
+
+def reconstruct_positions(
+    trades: Iterable[PositionTrade],
+    price_provider: PriceProvider,
+) -> dict[int, PositionSummary]:
+    """Replay BUY/SELL history with FIFO lot matching in one pass over date-ordered trades.
+
+    Lot sizes are amount-range midpoints. Each SELL consumes the oldest open lots for the
+    same politician and ticker; every matched slice contributes its holding-period return
+    and SPY's return over the same dates, weighted by the matched amount. SELLs with no
+    open lot (holdings acquired before the disclosure history) are ignored. Every lot is
+    opened and closed at most once, so after sorting the sweep is linear.
+    """
+    lots: dict[tuple[int, str], deque[Lot]] = {}
+    summaries: dict[int, PositionSummary] = {}
+    for trade in trades:
+        summary = summaries.get(trade.politician_id)
+        if summary is None:
+            summary = summaries[trade.politician_id] = PositionSummary()
+        key = (trade.politician_id, trade.ticker)
+        amount = amount_midpoint(trade.amount_range)
+        if trade.trade_type == "BUY":
+            price = price_provider.get_price(trade.ticker, trade.trade_date)
+            lots.setdefault(key, deque()).append(Lot(amount, trade.trade_date, price))
+            continue
+        if trade.trade_type != "SELL":
+            continue
+        open_lots = lots.get(key)
+        if not open_lots:
+            continue
+        sell_price = price_provider.get_price(trade.ticker, trade.trade_date)
+        spy_sell_price = price_provider.get_price("SPY", trade.trade_date)
+        remaining = amount
+        while remaining > 0 and open_lots:
+            lot = open_lots[0]
+            matched = min(remaining, lot.amount)
+            lot_return = _period_return(lot.price, sell_price)
+            spy_return = _period_return(price_provider.get_price("SPY", lot.opened_on), spy_sell_price)
+            if lot_return is not None and spy_return is not None:
+                summary.matched_amount += matched
+                summary.weighted_return += lot_return * matched
+                summary.weighted_spy_return += spy_return * matched
+            remaining -= matched
+            lot.amount -= matched
+            if lot.amount <= 0:
+                open_lots.popleft()
+                summary.closed_lot_count += 1
+
+    for (politician_id, ticker), open_lots in sorted(lots.items()):
+        if not open_lots:
+            continue
+        summaries[politician_id].open_positions.append(
+            OpenLotSummary(
+                ticker=ticker,
+                amount=sum(lot.amount for lot in open_lots),
+                opened_on=open_lots[0].opened_on,
+                lot_count=len(open_lots),
+            )
+        )
+    return summaries
+
+
+def load_position_trades(session: Session, politician_ids: set[int] | None = None) -> list[PositionTrade]:
+    query = session.query(Trade.politician_id, Trade.trade_date, Trade.ticker, Trade.trade_type, Trade.amount_range)
+    if politician_ids is not None:
+        query = query.filter(Trade.politician_id.in_(politician_ids))
+    rows = query.order_by(Trade.trade_date.asc(), Trade.id.asc()).all()
+    return [PositionTrade(*row) for row in rows]
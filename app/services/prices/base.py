@@ -7,3 +7,19 @@ from typing import Protocol
 class PriceProvider(Protocol):
     def get_price(self, ticker: str, on_date: date) -> float | None:
         raise NotImplementedError
+
+    def preload(self) -> None:
+        """Load any lazily-read price data up front."""
+        return None
+
+    def prefetch(self, windows: dict[str, tuple[date, date]]) -> None:
+        """Fetch prices for each ticker's ``(start, end)`` date range ahead of lookups."""
+        return None
+
+    def for_worker(self) -> PriceProvider:
+        """Return the provider handed to metrics worker processes.
+
+        By default workers get this instance: inherited under fork, pickled (a full copy)
+        under spawn.
+        """
+        return self
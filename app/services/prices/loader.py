@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import csv
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models import Price, Trade
+
+PriceRow = tuple[str, date, float]
+
+UPSERT_BATCH_SIZE = 500
+# Longest price lookup a trade makes: the 5y excess-return window.
+RETURN_WINDOW = timedelta(days=365 * 5)
+
+
+def read_price_csv(csv_path: Path) -> Iterator[PriceRow]:
+    with csv_path.open(newline="") as handle:
+        for row in csv.DictReader(handle):
+            yield row["ticker"].upper(), date.fromisoformat(row["date"]), float(row["close"])
+
+
+def _changed_rows(session: Session, rows: list[PriceRow]) -> list[PriceRow]:
+    bounds: dict[str, tuple[date, date]] = {}
+    for ticker, price_date, _ in rows:
+        start, end = bounds.get(ticker, (price_date, price_date))
+        bounds[ticker] = (min(start, price_date), max(end, price_date))
+    existing: dict[tuple[str, date], float] = {}
+    for ticker, (start, end) in bounds.items():
+        query = session.query(Price.price_date, Price.close).filter(
+            Price.ticker == ticker,
+            Price.price_date.between(start, end),
+        )
+        existing.update(((ticker, price_date), close) for price_date, close in query)
+    return [row for row in rows if existing.get((row[0], row[1])) != row[2]]
+
+
+def _affected_trade_ranges(changed_dates: Iterable[date]) -> list[tuple[date, date]]:
+    """Merge the trade-date ranges ``[d - RETURN_WINDOW, d]`` of each changed close.
+
+    A trade on ``t`` reads closes in ``[t, t + RETURN_WINDOW]``, so it is affected exactly
+    when some changed date falls in that window. Dates far apart stay separate ranges.
+    """
+    ranges: list[tuple[date, date]] = []
+    for changed_date in sorted(set(changed_dates)):
+        start = changed_date - RETURN_WINDOW
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1] = (ranges[-1][0], changed_date)
+        else:
+            ranges.append((start, changed_date))
+    return ranges
+
+
+def _flag_stale_trades(session: Session, changed: list[PriceRow]) -> int:
+    """Mark trades whose return windows include a new or corrected close."""
+    dates_by_ticker: dict[str, list[date]] = {}
+    for ticker, price_date, _ in changed:
+        dates_by_ticker.setdefault(ticker, []).append(price_date)
+    flagged = 0
+    for ticker, changed_dates in dates_by_ticker.items():
+        for start, end in _affected_trade_ranges(changed_dates):
+            query = session.query(Trade).filter(Trade.trade_date.between(start, end))
+            if ticker != "SPY":
+                # Every excess return is measured against SPY, so SPY changes touch all tickers.
+                query = query.filter(Trade.ticker == ticker)
+            flagged += query.update({Trade.metrics_stale: True}, synchronize_session=False)
+    return flagged
+
+
+def load_prices(session: Session, rows: Iterable[PriceRow]) -> int:
+    """Upsert closes and flag the trades they affect; returns the number of rows written.
+
+    Rows that already exist with the same close are skipped, so re-loading a full history
+    file only writes and flags what actually changed.
+    """
+    latest: dict[tuple[str, date], float] = {}
+    for ticker, price_date, close in rows:
+        latest[(ticker.upper(), price_date)] = close
+    changed = _changed_rows(session, [(ticker, price_date, close) for (ticker, price_date), close in latest.items()])
+    for offset in range(0, len(changed), UPSERT_BATCH_SIZE):
+        batch = changed[offset : offset + UPSERT_BATCH_SIZE]
+        statement = insert(Price).values(
+            [{"ticker": ticker, "date": price_date, "close": close} for ticker, price_date, close in batch]
+        )
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["ticker", "date"],
+                set_={"close": statement.excluded.close},
+            )
+        )
+    _flag_stale_trades(session, changed)
+    session.commit()
+    return len(changed)
+
+
+def seed_prices(session: Session, rows: Iterable[PriceRow]) -> int:
+    """Load ``rows`` only into an empty ``prices`` table.
+
+    Seeding is a one-time bootstrap; re-applying it on every ingest would revert closes
+    added or corrected since with ``load_prices``.
+    """
+    if session.query(Price).first() is not None:
+        return 0
+    return load_prices(session, rows)
@@ -20,6 +20,10 @@ class SampleCsvPriceProvider(PriceProvider):
                 prices[(row["ticker"].upper(), date.fromisoformat(row["date"]))] = float(row["close"])
         self._prices = prices
 
+    def preload(self) -> None:
+        if self._prices is None:
+            self._load()
+
     def get_price(self, ticker: str, on_date: date) -> float | None:
         if self._prices is None:
             self._load()
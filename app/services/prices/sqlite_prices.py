@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Callable
+
+from sqlalchemy import and_, create_engine, or_
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models import Price
+from app.services.prices.base import PriceProvider
+
+RANGES_PER_QUERY = 100
+
+
+class ReadOnlySessionFactory:
+    """Opens ``path`` read-only on first use, so each process gets its own connection.
+
+    Only the path is pickled; a copy inherited through fork has no engine yet either.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._sessionmaker: sessionmaker | None = None
+
+    def __getstate__(self) -> dict[str, str]:
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict[str, str]) -> None:
+        self.__init__(state["path"])
+
+    def __call__(self) -> Session:
+        if self._sessionmaker is None:
+            engine = create_engine(f"sqlite:///file:{self.path}?mode=ro&uri=true")
+            self._sessionmaker = sessionmaker(bind=engine)
+        return self._sessionmaker()
+
+
+class SqlitePriceProvider(PriceProvider):
+    """Reads closes from the ``prices`` table, fetched in ticker date ranges and cached."""
+
+    def __init__(self, session_factory: Callable[[], Session]) -> None:
+        self.session_factory = session_factory
+        self._prices: dict[tuple[str, date], float] = {}
+        self._windows: dict[str, list[tuple[date, date]]] = {}
+        # Ranges to fetch on a ticker's first lookup; set on worker copies.
+        self._pending: dict[str, list[tuple[date, date]]] = {}
+
+    def for_worker(self) -> PriceProvider:
+        """Hand workers the database path and prefetch ranges rather than the cache.
+
+        Each worker reads the tickers its shard needs over its own read-only connection,
+        under fork and spawn alike. In-memory databases cannot be reopened, so they are
+        shared as-is.
+        """
+        with self.session_factory() as session:
+            path = session.get_bind().url.database
+        if not path or path == ":memory:":
+            return self
+        worker = SqlitePriceProvider(ReadOnlySessionFactory(path))
+        worker._pending = {ticker: list(ranges) for ticker, ranges in self._windows.items()}
+        return worker
+
+    def prefetch(self, windows: dict[str, tuple[date, date]]) -> None:
+        self._fetch_ranges([(ticker.upper(), start, end) for ticker, (start, end) in windows.items()])
+
+    def _fetch_ranges(self, ranges: list[tuple[str, date, date]]) -> None:
+        with self.session_factory() as session:
+            for offset in range(0, len(ranges), RANGES_PER_QUERY):
+                chunk = ranges[offset : offset + RANGES_PER_QUERY]
+                rows = session.query(Price.ticker, Price.price_date, Price.close).filter(
+                    or_(
+                        *(
+                            and_(Price.ticker == ticker, Price.price_date.between(start, end))
+                            for ticker, start, end in chunk
+                        )
+                    )
+                )
+                for ticker, price_date, close in rows:
+                    self._prices[(ticker, price_date)] = close
+                for ticker, start, end in chunk:
+                    self._windows.setdefault(ticker, []).append((start, end))
+
+    def _is_prefetched(self, ticker: str, on_date: date) -> bool:
+        return any(start <= on_date <= end for start, end in self._windows.get(ticker, ()))
+
+    def get_price(self, ticker: str, on_date: date) -> float | None:
+        ticker = ticker.upper()
+        pending = self._pending.pop(ticker, None)
+        if pending:
+            self._fetch_ranges([(ticker, start, end) for start, end in pending])
+        key = (ticker, on_date)
+        if key in self._prices:
+            return self._prices[key]
+        if self._is_prefetched(ticker, on_date):
+            return None
+        with self.session_factory() as session:
+            close = (
+                session.query(Price.close)
+                .filter(Price.ticker == ticker, Price.price_date == on_date)
+                .scalar()
+            )
+        if close is not None:
+            self._prices[key] = close
+        return close
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models import Trade, TradeRollup
+
+ROLLUP_DIMENSIONS = ("period", "ticker", "politician_id", "trade_type")
+
+RollupKey = tuple[str, str, int, str]
+
+
+def parse_amount_range(amount_range: str) -> tuple[int, int]:
+    """Return the (low, high) dollar bounds of a disclosure range like ``$1,001 - $15,000``.
+
+    Open-ended ranges such as ``Over $50,000,000`` use the single bound for both ends.
+    """
+    bounds = []
+    for part in amount_range.split("-"):
+        digits = "".join(ch for ch in part if ch.isdigit())
+        if digits:
+            bounds.append(int(digits))
+    if not bounds:
+        return 0, 0
+    return bounds[0], bounds[-1]
+
+
+def period_for(trade_date: date) -> str:
+    return f"{trade_date.year:04d}-{trade_date.month:02d}"
+
+
+def _accumulate(
+    totals: dict[RollupKey, list[int]],
+    key: RollupKey,
+    amount_range: str,
+    count: int = 1,
+) -> None:
+    low, high = parse_amount_range(amount_range)
+    entry = totals[key]
+    entry[0] += count
+    entry[1] += low * count
+    entry[2] += high * count
+
+
+def _merge(session: Session, totals: dict[RollupKey, list[int]]) -> None:
+    for key, (count, low_total, high_total) in totals.items():
+        rollup = session.get(TradeRollup, key)
+        if rollup is None:
+            period, ticker, politician_id, trade_type = key
+            rollup = TradeRollup(
+                period=period,
+                ticker=ticker,
+                politician_id=politician_id,
+                trade_type=trade_type,
+                trade_count=0,
+                amount_low_total=0,
+                amount_high_total=0,
+            )
+            session.add(rollup)
+        rollup.trade_count += count
+        rollup.amount_low_total += low_total
+        rollup.amount_high_total += high_total
+
+
+def apply_trades_to_rollups(session: Session, trades: Iterable[Trade]) -> None:
+    """Fold newly inserted trades into the rollup table without rescanning ``trades``."""
+    totals: dict[RollupKey, list[int]] = defaultdict(lambda: [0, 0, 0])
+    for trade in trades:
+        key = (period_for(trade.trade_date), trade.ticker, trade.politician_id, trade.trade_type)
+        _accumulate(totals, key, trade.amount_range)
+    _merge(session, totals)
+
+
+def rebuild_rollups(session: Session) -> None:
+    """Recompute every rollup row from the full trade history."""
+    session.query(TradeRollup).delete()
+    period = func.strftime("%Y-%m", Trade.trade_date)
+    rows = (
+        session.query(
+            period,
+            Trade.ticker,
+            Trade.politician_id,
+            Trade.trade_type,
+            Trade.amount_range,
+            func.count(Trade.id),
+        )
+        .group_by(period, Trade.ticker, Trade.politician_id, Trade.trade_type, Trade.amount_range)
+        .all()
+    )
+    totals: dict[RollupKey, list[int]] = defaultdict(lambda: [0, 0, 0])
+    for row_period, ticker, politician_id, trade_type, amount_range, count in rows:
+        _accumulate(totals, (row_period, ticker, politician_id, trade_type), amount_range, count)
+    _merge(session, totals)
+
+
+def query_rollups(
+    session: Session,
+    group_by: list[str] | None = None,
+    ticker: str | None = None,
+    politician_id: int | None = None,
+    trade_type: str | None = None,
+    period_from: str | None = None,
+    period_to: str | None = None,
+    sort: str | None = None,
+    limit: int = 100,
+) -> list[dict[str, str | int | None]]:
+    """Sum rollup rows grouped by ``group_by``; raises ``ValueError`` for unknown dimensions."""
+    unknown = sorted(set(group_by or ()) - set(ROLLUP_DIMENSIONS))
+    if unknown:
+        raise ValueError(f"Unknown rollup dimension: {', '.join(unknown)}")
+    dimensions = [dimension for dimension in ROLLUP_DIMENSIONS if dimension in (group_by or ROLLUP_DIMENSIONS)]
+    columns = [getattr(TradeRollup, dimension) for dimension in dimensions]
+    trade_count = func.sum(TradeRollup.trade_count).label("trade_count")
+    query = session.query(
+        *columns,
+        trade_count,
+        func.sum(TradeRollup.amount_low_total),
+        func.sum(TradeRollup.amount_high_total),
+    )
+    if ticker:
+        query = query.filter(TradeRollup.ticker == ticker.upper())
+    if politician_id:
+        query = query.filter(TradeRollup.politician_id == politician_id)
+    if trade_type:
+        query = query.filter(TradeRollup.trade_type == trade_type.upper())
+    if period_from:
+        query = query.filter(TradeRollup.period >= period_from)
+    if period_to:
+        query = query.filter(TradeRollup.period <= period_to)
+    if columns:
+        query = query.group_by(*columns)
+    sort = (sort or "period_asc").lower()
+    if sort == "trade_count_desc":
+        query = query.order_by(trade_count.desc())
+    elif sort == "period_desc" and "period" in dimensions:
+        query = query.order_by(TradeRollup.period.desc())
+    elif "period" in dimensions:
+        query = query.order_by(TradeRollup.period.asc())
+    results: list[dict[str, str | int | None]] = []
+    for row in query.limit(limit).all():
+        values = dict(zip(dimensions, row[: len(dimensions)]))
+        count, low_total, high_total = row[len(dimensions) :]
+        results.append(
+            {
+                "period": values.get("period"),
+                "ticker": values.get("ticker"),
+                "politician_id": values.get("politician_id"),
+                "trade_type": values.get("trade_type"),
+                "trade_count": count or 0,
+                "amount_low_total": low_total or 0,
+                "amount_high_total": high_total or 0,
+            }
+        )
+    return results
+
+
+def count_ticker_politicians(session: Session, ticker: str) -> int:
+    return (
+        session.query(func.count(func.distinct(TradeRollup.politician_id)))
+        .filter(TradeRollup.ticker == ticker.upper())
+        .scalar()
+        or 0
+    )
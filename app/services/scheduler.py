@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """Non-blocking exclusive lock on a file, shared by every process on the host."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._handle = None
+
+    @property
+    def held(self) -> bool:
+        return self._handle is not None
+
+    def acquire(self) -> bool:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = self.path.open("a+")
+        try:
+            if os.name == "nt":
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._handle = handle
+        return True
+
+    def release(self) -> None:
+        if self._handle is None:
+            return
+        if os.name == "nt":
+            msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+        self._handle.close()
+        self._handle = None
+
+
+class IngestionScheduler:
+    """Run ``job`` every ``interval_seconds`` from a background thread.
+
+    The job itself runs in a separate process by default so metric computation does not
+    compete with request handlers for the GIL. The first uvicorn worker to take the leader
+    lock keeps it until it stops, so only that worker runs the job; the others retry it
+    each tick and take over if the leader exits. Each run also takes ``lock_path``, which
+    the command-line scripts share, so a scheduled run never overlaps a manual one.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        lock_path: Path,
+        leader_lock_path: Path,
+        job: Callable[[], object],
+        use_process: bool = True,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.lock = FileLock(lock_path)
+        self.leader_lock = FileLock(leader_lock_path)
+        self.job = job
+        self.use_process = use_process
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executor: Executor | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="ingestion-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.leader_lock.release()
+
+    def run_once(self) -> bool:
+        """Run the job if this worker leads and no other run is in progress; returns whether it ran."""
+        if not self.leader_lock.held and not self.leader_lock.acquire():
+            return False
+        if not self.lock.acquire():
+            return False
+        try:
+            if self.use_process:
+                self._run_in_process()
+            else:
+                self.job()
+        except Exception:
+            logger.exception("Scheduled ingestion failed")
+        finally:
+            self.lock.release()
+        return True
+
+    def _run_in_process(self) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        try:
+            self._executor.submit(self.job).result()
+        except BrokenProcessPool:
+            # Start a fresh worker process on the next tick.
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            raise
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.run_once()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+from sqlalchemy import Connection, create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.schema import CreateTable
+
+from app.db import SCHEMA_VERSION, Base
+from app.services.ingestion import ingest_trades
+from app.services.prices.loader import PriceRow, seed_prices
+from app.services.prices.sqlite_prices import SqlitePriceProvider
+from app.services.sources.base import TradeSource
+
+# Safe only because nothing reads the file until it is complete and swapped in.
+BULK_LOAD_PRAGMAS = (
+    "PRAGMA journal_mode=OFF",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-262144",
+)
+
+# Copied verbatim from the live database so trade ids and ``created_at`` survive a rebuild
+# and change-feed watermarks (``since_id``, ``created_after``) stay valid, and so closes
+# loaded incrementally since the last rebuild are kept.
+CARRIED_TABLES = ("politicians", "trades", "ingestion_logs", "prices")
+
+
+def _apply_bulk_load_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in BULK_LOAD_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _copy_live_tables(connection: Connection, live_db: Path) -> None:
+    # ATTACH is not allowed inside a transaction, so it runs before the first INSERT opens one.
+    connection.exec_driver_sql("ATTACH DATABASE ? AS live", (str(live_db),))
+    try:
+        for name in CARRIED_TABLES:
+            columns = ", ".join(f'"{column.name}"' for column in Base.metadata.tables[name].columns)
+            connection.exec_driver_sql(f"INSERT INTO main.{name} ({columns}) SELECT {columns} FROM live.{name}")
+        connection.commit()
+    finally:
+        connection.exec_driver_sql("DETACH DATABASE live")
+
+
+def snapshot_path(data_dir: Path) -> Path:
+    return data_dir / f"trades-{datetime.utcnow():%Y%m%dT%H%M%S%f}.db"
+
+
+def build_snapshot(
+    target: Path,
+    sources: list[TradeSource],
+    price_rows: Iterable[PriceRow],
+    metrics_workers: int | None = None,
+    live_db: Path | None = None,
+) -> int:
+    """Build a complete database at ``target`` without touching the live one.
+
+    Tables are created without secondary indexes. When ``live_db`` is given, its
+    politicians, trades, ingestion logs, and prices are copied as-is and only trades from
+    ``sources`` that it lacks are ingested; rollups and metrics are recomputed from the
+    full history. ``price_rows`` seeds the prices table only if it is still empty. The file is then indexed and analyzed in one pass
+    and left in WAL mode, ready to be activated. Returns the number of new trades.
+    """
+    from app import models  # noqa: F401
+
+    build_engine = create_engine(f"sqlite:///{target}")
+    # Pragmas are per connection, so apply them to every connection the build opens.
+    event.listen(build_engine, "connect", _apply_bulk_load_pragmas)
+    try:
+        with build_engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                connection.execute(CreateTable(table))
+        if live_db is not None:
+            with build_engine.connect() as connection:
+                _copy_live_tables(connection, live_db)
+
+        session = Session(bind=build_engine)
+        try:
+            seed_prices(session, price_rows)
+            price_provider = SqlitePriceProvider(sessionmaker(bind=build_engine))
+            added = ingest_trades(session, sources, price_provider, metrics_workers=metrics_workers)
+        finally:
+            session.close()
+
+        with build_engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(bind=connection)
+            connection.execute(text("ANALYZE"))
+            connection.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+        with build_engine.connect() as connection:
+            connection.execute(text("PRAGMA journal_mode=WAL"))
+    finally:
+        build_engine.dispose()
+    return added
+
+
+def prune_snapshots(data_dir: Path, keep: list[Path]) -> None:
+    """Delete snapshot files other than ``keep`` (the live file and its predecessor)."""
+    keep_names = {path.name for path in keep}
+    for candidate in data_dir.glob("trades-*.db"):
+        if candidate.name in keep_names:
+            continue
+        for path in (candidate, Path(f"{candidate}-wal"), Path(f"{candidate}-shm")):
+            path.unlink(missing_ok=True)
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from datetime import date
 from typing import Protocol
 
 
-@dataclass
+def intern_text(value: str | None) -> str | None:
+    """Intern repeated disclosure strings so every row shares one copy."""
+    if value is None:
+        return None
+    return sys.intern(value)
+
+
+@dataclass(slots=True)
 class RawTrade:
     politician: str
     chamber: str | None
@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import json
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
 
-from app.services.sources.base import RawTrade
+from app.services.sources.base import RawTrade, intern_text
+
+# Disclosures cluster on a few thousand trading days; reuse one date object per day.
+_parse_date = lru_cache(maxsize=16384)(date.fromisoformat)
 
 
 class SampleJsonSource:
@@ -15,19 +19,18 @@ class SampleJsonSource:
 
     def fetch_trades(self) -> list[RawTrade]:
         payload = json.loads(self.data_path.read_text())
-        trades: list[RawTrade] = []
-        for entry in payload:
-            trades.append(
-                RawTrade(
-                    politician=entry["politician"],
-                    chamber=entry.get("chamber"),
-                    state=entry.get("state"),
-                    trade_date=date.fromisoformat(entry["trade_date"]),
-                    ticker=entry["ticker"].upper(),
-                    asset_name=entry.get("asset_name"),
-                    trade_type=entry["type"].upper(),
-                    amount_range=entry["amount_range"],
-                    source_url=entry["source_url"],
-                )
-            )
-        return trades
+        return [self.parse_entry(entry) for entry in payload]
+
+    @staticmethod
+    def parse_entry(entry: dict) -> RawTrade:
+        return RawTrade(
+            politician=intern_text(entry["politician"]),
+            chamber=intern_text(entry.get("chamber")),
+            state=intern_text(entry.get("state")),
+            trade_date=_parse_date(entry["trade_date"]),
+            ticker=intern_text(entry["ticker"].upper()),
+            asset_name=intern_text(entry.get("asset_name")),
+            trade_type=intern_text(entry["type"].upper()),
+            amount_range=intern_text(entry["amount_range"]),
+            source_url=entry["source_url"],
+        )
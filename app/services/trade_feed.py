@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+
+
+class TradeFeed:
+    """Broadcasts the highest committed trade id to asyncio subscribers.
+
+    ``publish`` is thread-safe so ingestion can call it from any thread. Every waiting
+    subscriber shares a single ``asyncio.Event``, so an idle connection costs one
+    suspended coroutine and nothing else.
+    """
+
+    def __init__(self) -> None:
+        self.latest_id = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._event: asyncio.Event | None = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop, latest_id: int = 0) -> None:
+        self._loop = loop
+        self._event = asyncio.Event()
+        self.latest_id = max(self.latest_id, latest_id)
+
+    def publish(self, latest_id: int) -> None:
+        if latest_id <= self.latest_id:
+            return
+        self.latest_id = latest_id
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self) -> None:
+        event, self._event = self._event, asyncio.Event()
+        if event is not None:
+            event.set()
+
+    async def wait_for(self, after_id: int, timeout: float) -> int:
+        """Wait until a trade newer than ``after_id`` is published or ``timeout`` passes."""
+        if self.latest_id > after_id:
+            return self.latest_id
+        if self._event is None:
+            await asyncio.sleep(timeout)
+            return self.latest_id
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.latest_id
+
+
+trade_feed = TradeFeed()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import Query, Session
+
+from app.models import Trade
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(trade: Trade) -> str:
+    return f"{trade.trade_date.isoformat()}:{trade.id}"
+
+
+def decode_cursor(cursor: str) -> tuple[date, int]:
+    raw_date, _, raw_id = cursor.partition(":")
+    return date.fromisoformat(raw_date), int(raw_id)
+
+
+def fetch_trade_page(
+    session: Session,
+    politician_id: int,
+    limit: int = PAGE_SIZE,
+    cursor: str | None = None,
+) -> tuple[list[Trade], str | None]:
+    """Return one page of a politician's trades, newest first, plus the cursor for the next page.
+
+    Pages are keyed on ``(trade_date, id)`` so each request is an index range scan on
+    ``ix_trades_politician_date_id`` regardless of how deep the client has paged.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = session.query(Trade).filter(Trade.politician_id == politician_id)
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                Trade.trade_date < cursor_date,
+                and_(Trade.trade_date == cursor_date, Trade.id < cursor_id),
+            )
+        )
+    rows = query.order_by(Trade.trade_date.desc(), Trade.id.desc()).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+
+def trade_counts_by_year(session: Session, politician_id: int) -> list[dict[str, int]]:
+    year = func.strftime("%Y", Trade.trade_date).label("year")
+    rows = (
+        session.query(
+            year,
+            func.count(Trade.id),
+            func.sum(case((Trade.trade_type == "BUY", 1), else_=0)),
+            func.sum(case((Trade.trade_type == "SELL", 1), else_=0)),
+        )
+        .filter(Trade.politician_id == politician_id)
+        .group_by(year)
+        .order_by(year.desc())
+        .all()
+    )
+    return [
+        {
+            "year": int(row_year),
+            "trade_count": trade_count,
+            "buy_count": buy_count or 0,
+            "sell_count": sell_count or 0,
+        }
+        for row_year, trade_count, buy_count, sell_count in rows
+    ]
+
+
+def fetch_trades_since(session: Session, since_id: int, limit: int = MAX_PAGE_SIZE) -> list[Trade]:
+    """Return trades inserted after ``since_id`` in insertion order."""
+    return (
+        session.query(Trade)
+        .filter(Trade.id > since_id)
+        .order_by(Trade.id.asc())
+        .limit(max(1, min(limit, MAX_PAGE_SIZE)))
+        .all()
+    )
+
+
+def filter_created_after(query: Query, created_after: datetime, since_id: int | None = None) -> Query:
+    """Restrict ``query`` to trades after the ``(created_at, id)`` watermark.
+
+    Trades from one ingestion batch share a ``created_at``, so paging on the timestamp alone
+    would drop the rest of a batch cut off by ``limit``. Order pages by
+    ``(created_at, id)`` and pass the last trade's id as ``since_id`` to resume inside it.
+    """
+    if since_id is None:
+        watermark = Trade.created_at > created_after
+    else:
+        watermark = or_(
+            Trade.created_at > created_after,
+            and_(Trade.created_at == created_after, Trade.id > since_id),
+        )
+    return query.filter(watermark)
+
+
+def latest_trade_id(session: Session) -> int:
+    return session.query(func.max(Trade.id)).scalar() or 0
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache
+from sqlalchemy import Engine, func, select
+
+from app.models import Trade
+
+
+def enable_bytecode_cache(environment: Environment, cache_dir: Path) -> None:
+    """Persist compiled templates so later workers skip Jinja2 compilation."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    environment.bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+
+
+def precompile_templates(environment: Environment) -> int:
+    names = environment.list_templates(extensions=["html"])
+    for name in names:
+        environment.get_template(name)
+    return len(names)
+
+
+def prime_database(bind: Engine) -> None:
+    with bind.connect() as connection:
+        connection.execute(select(func.count(Trade.id))).scalar()
+
+
+def warmup(environment: Environment, bind: Engine) -> dict[str, float]:
+    """Prime template and connection caches; returns seconds spent per step."""
+    timings: dict[str, float] = {}
+    for step, action in (
+        ("templates", lambda: precompile_templates(environment)),
+        ("database", lambda: prime_database(bind)),
+    ):
+        started = time.perf_counter()
+        action()
+        timings[step] = time.perf_counter() - started
+    return timings
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from app.services.ingestion import normalize_trade
+from app.services.sources.sample_json_source import SampleJsonSource
+
+MODES = ("current", "baseline")
+
+
+@dataclass
+class BaselineRawTrade:
+    """RawTrade as it was before slots and interning, kept for comparison runs."""
+
+    politician: str
+    chamber: str | None
+    state: str | None
+    trade_date: date
+    ticker: str
+    asset_name: str | None
+    trade_type: str
+    amount_range: str
+    source_url: str
+
+
+def baseline_parse_entry(entry: dict) -> BaselineRawTrade:
+    return BaselineRawTrade(
+        politician=entry["politician"],
+        chamber=entry.get("chamber"),
+        state=entry.get("state"),
+        trade_date=date.fromisoformat(entry["trade_date"]),
+        ticker=entry["ticker"].upper(),
+        asset_name=entry.get("asset_name"),
+        trade_type=entry["type"].upper(),
+        amount_range=entry["amount_range"],
+        source_url=entry["source_url"],
+    )
+
+
+def baseline_normalize_trade(raw: BaselineRawTrade, source: SampleJsonSource) -> dict:
+    payload = asdict(raw)
+    payload["trade_type"] = payload["trade_type"].upper()
+    payload["ticker"] = payload["ticker"].upper()
+    payload["source"] = source.source_name
+    return payload
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark disclosure parsing and normalization.")
+    parser.add_argument("--trades", type=int, default=200_000, help="Number of synthetic trades to process.")
+    parser.add_argument(
+        "--mode",
+        choices=MODES + ("compare",),
+        default="current",
+        help="'baseline' runs the old asdict path; 'compare' runs both in separate processes.",
+    )
+    return parser.parse_args()
+
+
+def load_entries(count: int) -> list[dict]:
+    """Build ``count`` disclosure entries by cycling the sample data with unique source URLs.
+
+    Each entry is round-tripped through JSON so it owns its strings, as a parsed payload would.
+    """
+    sample = json.loads((BASE_DIR / "data" / "sample_trades.json").read_text())
+    entries = []
+    for index in range(count):
+        entry = dict(sample[index % len(sample)])
+        entry["source_url"] = f"{entry['source_url']}?row={index}"
+        entries.append(json.loads(json.dumps(entry)))
+    return entries
+
+
+def run(entries: list[dict], source: SampleJsonSource, mode: str) -> list[dict]:
+    # Mirror ingestion: fetch_trades materializes every RawTrade before normalizing.
+    if mode == "baseline":
+        raw_trades = [baseline_parse_entry(entry) for entry in entries]
+        return [baseline_normalize_trade(raw, source) for raw in raw_trades]
+    raw_trades = [source.parse_entry(entry) for entry in entries]
+    return [normalize_trade(raw, source) for raw in raw_trades]
+
+
+def max_rss_bytes() -> int:
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def benchmark(trades: int, mode: str) -> None:
+    entries = load_entries(trades)
+    source = SampleJsonSource(BASE_DIR / "data" / "sample_trades.json")
+    scale = 1_000_000 / trades
+
+    rss_before = max_rss_bytes()
+    started = time.process_time()
+    rows = run(entries, source, mode)
+    cpu_seconds = time.process_time() - started
+    rss_after = max_rss_bytes()
+
+    print(f"[{mode}] Processed {len(rows):,} trades.")
+    print(f"[{mode}] CPU per million trades: {cpu_seconds * scale:.2f}s")
+    print(f"[{mode}] Peak RSS: {rss_after / 2**20:.1f} MiB")
+    print(f"[{mode}] Peak RSS growth per million trades: {(rss_after - rss_before) * scale / 2**20:.1f} MiB")
+
+
+def main() -> None:
+    args = parse_args()
+    if args.mode != "compare":
+        benchmark(args.trades, args.mode)
+        return
+    # Peak RSS is a per-process high-water mark, so each mode needs a fresh interpreter.
+    for mode in MODES:
+        subprocess.run(
+            [sys.executable, __file__, "--trades", str(args.trades), "--mode", mode],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
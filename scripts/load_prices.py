@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from app.services.pipeline import INGESTION_LOCK_PATH, run_price_load
+from app.services.scheduler import FileLock
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load daily closes and refresh affected metrics.")
+    parser.add_argument("csv_path", type=Path, help="CSV file with ticker,date,close columns.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("METRICS_WORKERS", "1")),
+        help="Processes used to compute metrics (default: $METRICS_WORKERS or 1).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    lock = FileLock(INGESTION_LOCK_PATH)
+    if not lock.acquire():
+        sys.exit("Another ingestion is already running.")
+    try:
+        written, refreshed = run_price_load(args.csv_path, metrics_workers=args.workers)
+    finally:
+        lock.release()
+    print(f"Price load complete. Wrote {written} prices; refreshed metrics for {refreshed} politicians.")
+
+
+if __name__ == "__main__":
+    main()
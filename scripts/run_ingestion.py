@@ -1,29 +1,53 @@
 from __future__ import annotations
 
+import argparse
+import os
 import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 sys.path.append(str(BASE_DIR))
 
-from app.db import SessionLocal, init_db
-from app.services.ingestion import ingest_trades
-from app.services.prices.sample_csv_prices import SampleCsvPriceProvider
-from app.services.sources.sample_json_source import SampleJsonSource
-from app.services.sources.provider_stub import ProviderStub
+from app.services.pipeline import INGESTION_LOCK_PATH, rebuild_database, run_ingestion
+from app.services.scheduler import FileLock
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ingest trade disclosures and refresh metrics.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("METRICS_WORKERS", "1")),
+        help="Processes used to compute metrics (default: $METRICS_WORKERS or 1).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Commit every N trades/metrics rows instead of in one transaction.",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Build a fresh database offline and swap it in atomically when complete.",
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
-    init_db()
-    session = SessionLocal()
-    sources = [
-        SampleJsonSource(BASE_DIR / "data" / "sample_trades.json"),
-        ProviderStub(),
-    ]
-    price_provider = SampleCsvPriceProvider(BASE_DIR / "data" / "sample_prices.csv")
-    added = ingest_trades(session, sources, price_provider)
-    session.close()
-    print(f"Ingestion complete. Added {added} new trades.")
+    args = parse_args()
+    lock = FileLock(INGESTION_LOCK_PATH)
+    if not lock.acquire():
+        sys.exit("Another ingestion is already running.")
+    try:
+        if args.rebuild:
+            added = rebuild_database(metrics_workers=args.workers)
+            print(f"Rebuild complete. Added {added} new trades.")
+        else:
+            added = run_ingestion(metrics_workers=args.workers, batch_size=args.batch_size)
+            print(f"Ingestion complete. Added {added} new trades.")
+    finally:
+        lock.release()
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.db import Base
-from app.models import Trade
+from app.models import IngestionLog, Politician, Trade
 from app.services.ingestion import ingest_trades, normalize_trade
 from app.services.prices.base import PriceProvider
 from app.services.sources.base import RawTrade, TradeSource
@@ -82,3 +82,64 @@ def test_deduplication() -> None:
     assert added_first == 1
     assert added_second == 0
     assert session.query(Trade).count() == 1
+
+
+def test_batched_ingestion_matches_single_transaction() -> None:
+    trades = [
+        RawTrade(
+            politician=f"Rep. Test {index % 3}",
+            chamber="House",
+            state="CA",
+            trade_date=date(2020, 1, 1 + index),
+            ticker="AAPL",
+            asset_name="Apple",
+            trade_type="BUY",
+            amount_range="$1,001 - $15,000",
+            source_url=f"https://example.com/{index}",
+        )
+        for index in range(7)
+    ]
+    single = create_session()
+    batched = create_session()
+    assert ingest_trades(single, [DummySource(trades)], DummyPriceProvider()) == 7
+    assert ingest_trades(batched, [DummySource(trades)], DummyPriceProvider(), batch_size=2) == 7
+    assert batched.query(Trade).count() == single.query(Trade).count() == 7
+
+
+def test_rolled_back_batch_is_not_counted_and_can_retry(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'trades.db'}")
+    Base.metadata.create_all(bind=engine)
+    make_session = sessionmaker(bind=engine)
+
+    def make_trade(index: int) -> RawTrade:
+        return RawTrade(
+            politician="Rep. Test",
+            chamber="House",
+            state="CA",
+            trade_date=date(2020, 1, 1 + index),
+            ticker="AAPL",
+            asset_name="Apple",
+            trade_type="BUY",
+            amount_range="$1,001 - $15,000",
+            source_url=f"https://example.com/{index}",
+        )
+
+    class RacingSource(DummySource):
+        def fetch_trades(self) -> list[RawTrade]:
+            # Another writer stores trade 0 after dedup keys were loaded.
+            other = make_session()
+            politician = Politician(name="Rep. Test", chamber="House", state="CA")
+            other.add(politician)
+            other.flush()
+            other.add(Trade(politician_id=politician.id, **normalize_trade(make_trade(0), self)))
+            other.commit()
+            other.close()
+            return self._trades
+
+    session = make_session()
+    source = RacingSource([make_trade(0), make_trade(1), make_trade(2), make_trade(1)])
+    added = ingest_trades(session, [source], DummyPriceProvider(), batch_size=2)
+
+    assert added == 2
+    assert session.query(Trade).count() == 3
+    assert session.query(IngestionLog.trades_added).scalar() == 2
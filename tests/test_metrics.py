@@ -3,11 +3,11 @@ from __future__ import annotations
 from datetime import date
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.db import Base
-from app.models import Politician, Trade
+from app.models import Metrics, Politician, Trade
 from app.services.ingestion import ingest_trades
 from app.services.metrics import compute_excess_returns, refresh_metrics
 from app.services.prices.base import PriceProvider
@@ -102,3 +102,41 @@ def test_sample_metrics_have_non_zero_returns() -> None:
         if politician.metrics is not None
     ]
     assert any(value is not None and abs(value) > 0.001 for value in metrics_values)
+
+
+def test_parallel_refresh_matches_serial() -> None:
+    base_dir = Path(__file__).resolve().parents[1]
+    trades_source = SampleJsonSource(base_dir / "data" / "sample_trades.json")
+    price_provider = SampleCsvPriceProvider(base_dir / "data" / "sample_prices.csv")
+    session = create_session()
+    ingest_trades(session, [trades_source], price_provider)
+
+    def snapshot() -> list[tuple]:
+        return [
+            (
+                metrics.politician_id,
+                metrics.trade_count,
+                metrics.buy_count,
+                metrics.sell_count,
+                metrics.most_traded_tickers,
+                metrics.excess_return_1y,
+                metrics.excess_return_5y,
+            )
+            for metrics in session.query(Metrics).order_by(Metrics.politician_id).all()
+        ]
+
+    serial = snapshot()
+    refresh_metrics(session, price_provider, workers=2)
+    assert snapshot() == serial
+
+
+def test_refresh_metrics_commits_metrics_and_positions_once() -> None:
+    session = create_session()
+    base_dir = Path(__file__).resolve().parents[1]
+    provider = SampleCsvPriceProvider(base_dir / "data" / "sample_prices.csv")
+    ingest_trades(session, [SampleJsonSource(base_dir / "data" / "sample_trades.json")], provider)
+
+    commits: list[int] = []
+    event.listen(session, "after_commit", lambda _session: commits.append(1))
+    refresh_metrics(session, provider)
+    assert len(commits) == 1
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import OpenPosition, Politician, Trade
+from app.services.metrics import refresh_metrics
+from app.services.positions import PositionTrade, amount_midpoint, reconstruct_positions
+from app.services.prices.base import PriceProvider
+
+
+class DictPriceProvider(PriceProvider):
+    def __init__(self, data: dict[tuple[str, date], float]) -> None:
+        self.data = data
+
+    def get_price(self, ticker: str, on_date: date) -> float | None:
+        return self.data.get((ticker, on_date))
+
+
+PRICES = DictPriceProvider(
+    {
+        ("ABC", date(2020, 1, 1)): 100,
+        ("ABC", date(2020, 2, 1)): 150,
+        ("ABC", date(2020, 3, 1)): 200,
+        ("SPY", date(2020, 1, 1)): 100,
+        ("SPY", date(2020, 2, 1)): 110,
+        ("SPY", date(2020, 3, 1)): 110,
+    }
+)
+SMALL = "$1,001 - $15,000"
+MEDIUM = "$15,001 - $50,000"
+
+
+def test_amount_midpoint() -> None:
+    assert amount_midpoint(SMALL) == 8000.5
+
+
+def test_fifo_matching_splits_lots_and_reports_open_positions() -> None:
+    trades = [
+        PositionTrade(1, date(2020, 1, 1), "ABC", "SELL", SMALL),
+        PositionTrade(1, date(2020, 1, 1), "ABC", "BUY", SMALL),
+        PositionTrade(1, date(2020, 2, 1), "ABC", "BUY", MEDIUM),
+        PositionTrade(1, date(2020, 3, 1), "ABC", "SELL", MEDIUM),
+    ]
+    summary = reconstruct_positions(trades, PRICES)[1]
+
+    # The first SELL has no open lot. The last SELL (32,500.5) closes the January lot
+    # (8,000.5 at +100% vs SPY +10%) and takes 24,500 from the February lot
+    # (+33.3% vs SPY 0%).
+    first, second = 8000.5, 32500.5 - 8000.5
+    expected_return = (first * 1.0 + second * (200 - 150) / 150) / (first + second)
+    expected_spy = (first * 0.1) / (first + second)
+    assert summary.closed_lot_count == 1
+    assert abs(summary.realized_return - expected_return) < 1e-9
+    assert abs(summary.realized_excess_return - (expected_return - expected_spy)) < 1e-9
+    [position] = summary.open_positions
+    assert position.ticker == "ABC"
+    assert position.amount == 32500.5 - second
+    assert position.opened_on == date(2020, 2, 1)
+
+
+def test_refresh_metrics_stores_realized_returns_and_open_positions() -> None:
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    politician = Politician(name="Rep. Test", chamber="House", state="CA")
+    session.add(politician)
+    session.commit()
+    for trade_date, trade_type, amount_range in [
+        (date(2020, 1, 1), "BUY", SMALL),
+        (date(2020, 2, 1), "BUY", SMALL),
+        (date(2020, 3, 1), "SELL", SMALL),
+    ]:
+        session.add(
+            Trade(
+                politician_id=politician.id,
+                trade_date=trade_date,
+                ticker="ABC",
+                asset_name="ABC",
+                trade_type=trade_type,
+                amount_range=amount_range,
+                source="dummy",
+                source_url=f"https://example.com/{trade_date}",
+            )
+        )
+    session.commit()
+
+    refresh_metrics(session, PRICES)
+    metrics = politician.metrics
+    assert metrics.closed_lot_count == 1
+    assert round(metrics.realized_return, 4) == 1.0
+    assert round(metrics.realized_excess_return, 4) == 0.9
+    [position] = session.query(OpenPosition).all()
+    assert (position.ticker, position.opened_on, position.lot_count) == ("ABC", date(2020, 2, 1), 1)
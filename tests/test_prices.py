@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import pickle
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base, create_sqlite_engine
+from app.models import Metrics, Politician, Price, Trade
+from app.services.ingestion import ingest_trades
+from app.services.metrics import refresh_metrics, refresh_stale_metrics
+from app.services.prices.loader import load_prices, read_price_csv, seed_prices
+from app.services.prices.sqlite_prices import SqlitePriceProvider
+from app.services.sources.sample_json_source import SampleJsonSource
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+
+def create_session_factory():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def add_trade(session, politician: Politician, ticker: str, trade_date: date) -> None:
+    session.add(
+        Trade(
+            politician_id=politician.id,
+            trade_date=trade_date,
+            ticker=ticker,
+            asset_name=ticker,
+            trade_type="BUY",
+            amount_range="$1,001 - $15,000",
+            source="dummy",
+            source_url=f"https://example.com/{ticker}/{trade_date}",
+        )
+    )
+
+
+def test_load_prices_upserts_only_changed_rows() -> None:
+    session = create_session_factory()()
+    rows = [("abc", date(2020, 1, 1), 100.0), ("ABC", date(2020, 1, 2), 101.0)]
+    assert load_prices(session, rows) == 2
+    assert load_prices(session, rows) == 0
+    assert load_prices(session, [("ABC", date(2020, 1, 2), 102.0), ("ABC", date(2020, 1, 3), 103.0)]) == 2
+    closes = {row.price_date: row.close for row in session.query(Price).all()}
+    assert closes == {date(2020, 1, 1): 100.0, date(2020, 1, 2): 102.0, date(2020, 1, 3): 103.0}
+
+
+def test_seed_prices_only_fills_an_empty_table() -> None:
+    session = create_session_factory()()
+    seed = [("ABC", date(2020, 1, 1), 100.0)]
+    assert seed_prices(session, seed) == 1
+    load_prices(session, [("ABC", date(2020, 1, 1), 999.0)])
+
+    assert seed_prices(session, seed) == 0
+    assert session.query(Price.close).scalar() == 999.0
+
+
+def test_far_apart_changes_flag_only_trades_whose_windows_contain_them() -> None:
+    session = create_session_factory()()
+    politician = Politician(name="Rep. Test")
+    session.add(politician)
+    session.commit()
+    for trade_date in (date(2010, 1, 1), date(2016, 6, 1), date(2018, 6, 1), date(2026, 1, 1)):
+        add_trade(session, politician, "XYZ", trade_date)
+    session.commit()
+
+    load_prices(session, [("XYZ", date(2012, 6, 1), 10.0), ("XYZ", date(2030, 1, 2), 20.0)])
+
+    stale = {trade.trade_date for trade in session.query(Trade).filter(Trade.metrics_stale)}
+    assert stale == {date(2010, 1, 1), date(2026, 1, 1)}
+
+
+def test_sqlite_price_provider_prefetches_ranges() -> None:
+    factory = create_session_factory()
+    session = factory()
+    load_prices(session, [("ABC", date(2020, 1, 1), 100.0), ("ABC", date(2021, 1, 1), 120.0)])
+
+    provider = SqlitePriceProvider(factory)
+    provider.prefetch({"ABC": (date(2020, 1, 1), date(2020, 12, 31))})
+    assert provider.get_price("abc", date(2020, 1, 1)) == 100.0
+    assert provider.get_price("ABC", date(2020, 6, 1)) is None
+    assert provider.get_price("ABC", date(2021, 1, 1)) == 120.0
+
+
+def test_new_prices_refresh_only_affected_politicians() -> None:
+    factory = create_session_factory()
+    session = factory()
+    early = Politician(name="Rep. Early")
+    late = Politician(name="Rep. Late")
+    session.add_all([early, late])
+    session.commit()
+    add_trade(session, early, "ABC", date(2014, 1, 1))
+    add_trade(session, late, "XYZ", date(2020, 1, 2))
+    session.commit()
+    provider = SqlitePriceProvider(factory)
+    refresh_metrics(session, provider)
+
+    load_prices(
+        session,
+        [
+            ("XYZ", date(2020, 1, 2), 50.0),
+            ("XYZ", date(2020, 12, 31), 75.0),
+            ("ABC", date(2025, 1, 1), 10.0),
+        ],
+    )
+    stale = {trade.ticker for trade in session.query(Trade).filter(Trade.metrics_stale.is_(True))}
+    assert stale == {"XYZ"}
+
+    assert refresh_stale_metrics(session, SqlitePriceProvider(factory)) == 1
+    assert session.query(Trade).filter(Trade.metrics_stale.is_(True)).count() == 0
+    assert refresh_stale_metrics(session, SqlitePriceProvider(factory)) == 0
+
+
+def test_parallel_workers_read_prices_over_their_own_connection(tmp_path) -> None:
+    engine = create_sqlite_engine(tmp_path / "trades.db")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    session = factory()
+    load_prices(session, read_price_csv(DATA_DIR / "sample_prices.csv"))
+    provider = SqlitePriceProvider(factory)
+    ingest_trades(session, [SampleJsonSource(DATA_DIR / "sample_trades.json")], provider)
+    serial = [(row.politician_id, row.excess_return_1y, row.excess_return_5y) for row in session.query(Metrics)]
+
+    refresh_metrics(session, SqlitePriceProvider(factory), workers=2)
+    session.expire_all()
+    parallel = [(row.politician_id, row.excess_return_1y, row.excess_return_5y) for row in session.query(Metrics)]
+    assert parallel == serial
+
+    provider.prefetch({"SPY": (date(2018, 1, 1), date(2018, 12, 31))})
+    worker = pickle.loads(pickle.dumps(provider.for_worker()))
+    assert worker._prices == {}
+    assert worker.get_price("SPY", date(2018, 2, 15)) == 291.2
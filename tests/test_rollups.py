@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import TradeRollup
+from app.services.ingestion import ingest_trades
+from app.services.prices.base import PriceProvider
+from app.services.rollups import count_ticker_politicians, parse_amount_range, query_rollups, rebuild_rollups
+from app.services.sources.base import RawTrade, TradeSource
+from app.services.sources.sample_json_source import SampleJsonSource
+
+
+class DummySource(TradeSource):
+    source_name = "dummy"
+
+    def __init__(self, trades: list[RawTrade]) -> None:
+        self._trades = trades
+
+    def fetch_trades(self) -> list[RawTrade]:
+        return self._trades
+
+
+class DummyPriceProvider(PriceProvider):
+    def get_price(self, ticker: str, on_date: date) -> float | None:
+        return 100.0
+
+
+def create_session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def make_trade(trade_date: date, ticker: str, trade_type: str, amount_range: str) -> RawTrade:
+    return RawTrade(
+        politician="Rep. Test",
+        chamber="House",
+        state="CA",
+        trade_date=trade_date,
+        ticker=ticker,
+        asset_name=ticker,
+        trade_type=trade_type,
+        amount_range=amount_range,
+        source_url=f"https://example.com/{ticker}/{trade_date}/{trade_type}",
+    )
+
+
+def snapshot(session) -> dict[tuple, tuple]:
+    return {
+        (row.period, row.ticker, row.politician_id, row.trade_type): (
+            row.trade_count,
+            row.amount_low_total,
+            row.amount_high_total,
+        )
+        for row in session.query(TradeRollup).all()
+    }
+
+
+def test_parse_amount_range() -> None:
+    assert parse_amount_range("$1,001 - $15,000") == (1001, 15000)
+    assert parse_amount_range("Over $50,000,000") == (50000000, 50000000)
+    assert parse_amount_range("Unknown") == (0, 0)
+
+
+def test_incremental_rollups_match_rebuild() -> None:
+    session = create_session()
+    first_batch = [
+        make_trade(date(2024, 1, 5), "NVDA", "BUY", "$1,001 - $15,000"),
+        make_trade(date(2024, 1, 20), "NVDA", "BUY", "$15,001 - $50,000"),
+    ]
+    second_batch = first_batch + [
+        make_trade(date(2024, 1, 25), "NVDA", "SELL", "$1,001 - $15,000"),
+        make_trade(date(2024, 2, 2), "NVDA", "BUY", "$1,001 - $15,000"),
+    ]
+    ingest_trades(session, [DummySource(first_batch)], DummyPriceProvider())
+    ingest_trades(session, [DummySource(second_batch)], DummyPriceProvider())
+    incremental = snapshot(session)
+
+    rebuild_rollups(session)
+    session.commit()
+    assert snapshot(session) == incremental
+
+    monthly_buys = query_rollups(session, group_by=["period"], ticker="nvda", trade_type="buy")
+    assert [(row["period"], row["trade_count"], row["amount_high_total"]) for row in monthly_buys] == [
+        ("2024-01", 2, 65000),
+        ("2024-02", 1, 15000),
+    ]
+
+
+def test_rollup_totals_match_sample_trades() -> None:
+    session = create_session()
+    base_dir = Path(__file__).resolve().parents[1]
+    source = SampleJsonSource(base_dir / "data" / "sample_trades.json")
+    ingest_trades(session, [source], DummyPriceProvider())
+
+    by_ticker = query_rollups(session, group_by=["ticker"], sort="trade_count_desc", limit=1000)
+    assert sum(row["trade_count"] for row in by_ticker) == len(source.fetch_trades())
+    counts = [row["trade_count"] for row in by_ticker]
+    assert counts == sorted(counts, reverse=True)
+
+
+def test_ticker_politician_count_and_unknown_dimension() -> None:
+    session = create_session()
+    trades = [make_trade(date(2024, 1, 2), "NVDA", "BUY", "$1,001 - $15,000")]
+    other = make_trade(date(2024, 1, 3), "NVDA", "SELL", "$1,001 - $15,000")
+    other.politician = "Sen. Other"
+    ingest_trades(session, [DummySource(trades + [other])], DummyPriceProvider())
+
+    assert count_ticker_politicians(session, "nvda") == 2
+    assert count_ticker_politicians(session, "AAPL") == 0
+    with pytest.raises(ValueError):
+        query_rollups(session, group_by=["tickr"])
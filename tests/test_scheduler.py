@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from app.services.scheduler import FileLock, IngestionScheduler
+
+
+def make_scheduler(tmp_path: Path, interval: float, job) -> IngestionScheduler:
+    return IngestionScheduler(
+        interval,
+        tmp_path / "ingestion.lock",
+        tmp_path / "ingestion-leader.lock",
+        job,
+        use_process=False,
+    )
+
+
+def test_run_once_skips_when_lock_is_held(tmp_path: Path) -> None:
+    runs: list[int] = []
+    scheduler = make_scheduler(tmp_path, 60, lambda: runs.append(1))
+    manual_run = FileLock(tmp_path / "ingestion.lock")
+
+    assert manual_run.acquire()
+    assert scheduler.run_once() is False
+    manual_run.release()
+
+    assert scheduler.run_once() is True
+    assert runs == [1]
+    # The run lock is released after each run so command-line ingestion is not blocked.
+    assert manual_run.acquire()
+    manual_run.release()
+    scheduler.stop()
+
+
+def test_leader_keeps_lock_between_runs(tmp_path: Path) -> None:
+    runs: list[str] = []
+    leader = make_scheduler(tmp_path, 60, lambda: runs.append("leader"))
+    follower = make_scheduler(tmp_path, 60, lambda: runs.append("follower"))
+
+    assert leader.run_once() is True
+    assert follower.run_once() is False
+    assert leader.run_once() is True
+    assert follower.run_once() is False
+    assert runs == ["leader", "leader"]
+
+    leader.stop()
+    assert follower.run_once() is True
+    assert runs == ["leader", "leader", "follower"]
+    follower.stop()
+
+
+def test_scheduler_runs_on_interval_until_stopped(tmp_path: Path) -> None:
+    ran = threading.Event()
+    scheduler = make_scheduler(tmp_path, 0.01, ran.set)
+    scheduler.start()
+    try:
+        assert ran.wait(2)
+    finally:
+        scheduler.stop(timeout=2)
+    for name in ("ingestion.lock", "ingestion-leader.lock"):
+        lock = FileLock(tmp_path / name)
+        assert lock.acquire()
+        lock.release()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import func, inspect, text
+from sqlalchemy.orm import Session
+
+from app.db import SCHEMA_VERSION, ActiveDatabase, activate_database, create_sqlite_engine, get_schema_version
+from app.models import Price, Trade
+from app.services.prices.loader import load_prices, read_price_csv
+from app.services.snapshots import build_snapshot, prune_snapshots
+from app.services.sources.sample_json_source import SampleJsonSource
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+
+def build(target: Path, live_db: Path | None = None) -> int:
+    return build_snapshot(
+        target,
+        [SampleJsonSource(DATA_DIR / "sample_trades.json")],
+        read_price_csv(DATA_DIR / "sample_prices.csv"),
+        live_db=live_db,
+    )
+
+
+def trade_watermarks(path: Path) -> list[tuple]:
+    engine = create_sqlite_engine(path)
+    with Session(bind=engine) as session:
+        rows = session.query(Trade.id, Trade.created_at, Trade.source_url).order_by(Trade.id).all()
+    engine.dispose()
+    return [tuple(row) for row in rows]
+
+
+def test_build_snapshot_creates_indexed_analyzed_database(tmp_path: Path) -> None:
+    target = tmp_path / "trades-1.db"
+    added = build(target)
+
+    engine = create_sqlite_engine(target)
+    with Session(bind=engine) as session:
+        assert session.query(func.count(Trade.id)).scalar() == added > 0
+    index_names = {index["name"] for index in inspect(engine).get_indexes("trades")}
+    assert "ix_trades_politician_date_id" in index_names
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM sqlite_stat1")).scalar() > 0
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+    assert get_schema_version(engine) == SCHEMA_VERSION
+    engine.dispose()
+
+
+def test_rebuild_keeps_trade_ids_and_created_at(tmp_path: Path) -> None:
+    live = tmp_path / "trades-1.db"
+    build(live)
+    rebuilt = tmp_path / "trades-2.db"
+
+    assert build(rebuilt, live_db=live) == 0
+    assert trade_watermarks(rebuilt) == trade_watermarks(live)
+
+
+def test_rebuild_keeps_prices_loaded_since_seeding(tmp_path: Path) -> None:
+    live = tmp_path / "trades-1.db"
+    build(live)
+    engine = create_sqlite_engine(live)
+    with Session(bind=engine) as session:
+        load_prices(session, [("AAPL", date(2030, 1, 1), 250.0)])
+    engine.dispose()
+
+    rebuilt = tmp_path / "trades-2.db"
+    build(rebuilt, live_db=live)
+    engine = create_sqlite_engine(rebuilt)
+    with Session(bind=engine) as session:
+        close = session.query(Price.close).filter(Price.ticker == "AAPL", Price.price_date == date(2030, 1, 1))
+        assert close.scalar() == 250.0
+    engine.dispose()
+
+
+def test_active_database_follows_pointer(tmp_path: Path) -> None:
+    pointer = tmp_path / "trades.current"
+    default = tmp_path / "trades.db"
+    active = ActiveDatabase(pointer, default)
+    assert active.engine().url.database == str(default)
+
+    snapshot = tmp_path / "trades-2.db"
+    build(snapshot)
+    activate_database(snapshot, pointer)
+    assert active.engine().url.database == str(snapshot)
+    assert active.path == snapshot
+
+
+def test_prune_snapshots_keeps_live_and_previous(tmp_path: Path) -> None:
+    paths = [tmp_path / f"trades-{index}.db" for index in range(3)]
+    for path in paths:
+        path.write_bytes(b"")
+    prune_snapshots(tmp_path, keep=paths[1:])
+    assert sorted(path.name for path in tmp_path.glob("trades-*.db")) == ["trades-1.db", "trades-2.db"]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader
+from sqlalchemy import create_engine
+
+from app.db import SCHEMA_VERSION, get_schema_version, init_db
+from app.warmup import enable_bytecode_cache, warmup
+
+TEMPLATE_DIR = Path(__file__).resolve().parents[1] / "app" / "templates"
+
+
+def test_init_db_skips_current_schema(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'trades.db'}")
+
+    started = time.perf_counter()
+    assert init_db(engine) is True
+    cold_seconds = time.perf_counter() - started
+    assert get_schema_version(engine) == SCHEMA_VERSION
+
+    started = time.perf_counter()
+    assert init_db(engine) is False
+    warm_seconds = time.perf_counter() - started
+
+    assert warm_seconds < cold_seconds
+    assert warm_seconds < 0.5
+
+
+def test_warmup_precompiles_templates_into_bytecode_cache(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'trades.db'}")
+    init_db(engine)
+    environment = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)))
+    cache_dir = tmp_path / "jinja"
+    enable_bytecode_cache(environment, cache_dir)
+
+    timings = warmup(environment, engine)
+
+    assert set(timings) == {"templates", "database"}
+    assert sum(timings.values()) < 5.0
+    assert len(list(cache_dir.iterdir())) == len(environment.list_templates(extensions=["html"]))
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from app.services.trade_feed import TradeFeed
+
+
+def test_wait_for_wakes_on_publish_from_another_thread() -> None:
+    async def scenario() -> list[int]:
+        feed = TradeFeed()
+        feed.bind(asyncio.get_running_loop(), latest_id=5)
+        waiters = [asyncio.create_task(feed.wait_for(5, timeout=5)) for _ in range(100)]
+        await asyncio.sleep(0)
+        threading.Thread(target=feed.publish, args=(9,)).start()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(scenario()) == [9] * 100
+
+
+def test_wait_for_times_out_without_new_trades() -> None:
+    async def scenario() -> int:
+        feed = TradeFeed()
+        feed.bind(asyncio.get_running_loop(), latest_id=3)
+        feed.publish(2)
+        return await feed.wait_for(3, timeout=0.01)
+
+    assert asyncio.run(scenario()) == 3
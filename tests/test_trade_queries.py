@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import Politician, Trade
+from app.services.trade_queries import (
+    fetch_trade_page,
+    fetch_trades_since,
+    filter_created_after,
+    latest_trade_id,
+    trade_counts_by_year,
+)
+
+
+def create_session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def seed_trades(session, politician_id: int) -> None:
+    trade_dates = [date(2020, 1, 1), date(2020, 6, 1), date(2021, 3, 1), date(2021, 3, 1), date(2022, 2, 1)]
+    for index, trade_date in enumerate(trade_dates):
+        session.add(
+            Trade(
+                politician_id=politician_id,
+                trade_date=trade_date,
+                ticker="ABC",
+                asset_name="ABC",
+                trade_type="BUY" if index % 2 == 0 else "SELL",
+                amount_range="$1,001 - $15,000",
+                source="dummy",
+                source_url=f"https://example.com/{index}",
+            )
+        )
+    session.commit()
+
+
+def test_fetch_trade_page_walks_all_trades_with_cursor() -> None:
+    session = create_session()
+    politician = Politician(name="Rep. Test", chamber="House", state="CA")
+    session.add(politician)
+    session.commit()
+    seed_trades(session, politician.id)
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        trades, cursor = fetch_trade_page(session, politician.id, limit=2, cursor=cursor)
+        seen.extend(trade.id for trade in trades)
+        if cursor is None:
+            break
+
+    expected = [
+        trade.id
+        for trade in session.query(Trade).order_by(Trade.trade_date.desc(), Trade.id.desc()).all()
+    ]
+    assert seen == expected
+
+
+def test_trade_counts_by_year() -> None:
+    session = create_session()
+    politician = Politician(name="Rep. Test", chamber="House", state="CA")
+    session.add(politician)
+    session.commit()
+    seed_trades(session, politician.id)
+
+    summaries = trade_counts_by_year(session, politician.id)
+    assert summaries == [
+        {"year": 2022, "trade_count": 1, "buy_count": 1, "sell_count": 0},
+        {"year": 2021, "trade_count": 2, "buy_count": 1, "sell_count": 1},
+        {"year": 2020, "trade_count": 2, "buy_count": 1, "sell_count": 1},
+    ]
+
+
+def test_fetch_trades_since_returns_newer_trades_in_insert_order() -> None:
+    session = create_session()
+    politician = Politician(name="Rep. Test", chamber="House", state="CA")
+    session.add(politician)
+    session.commit()
+    seed_trades(session, politician.id)
+
+    ids = [trade.id for trade in session.query(Trade).order_by(Trade.id).all()]
+    assert [trade.id for trade in fetch_trades_since(session, ids[1])] == ids[2:]
+    assert latest_trade_id(session) == ids[-1]
+
+
+def test_created_after_pages_through_equal_timestamps() -> None:
+    session = create_session()
+    politician = Politician(name="Rep. Test", chamber="House", state="CA")
+    session.add(politician)
+    session.commit()
+    batches = [datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 10)]
+    for index in range(7):
+        session.add(
+            Trade(
+                politician_id=politician.id,
+                trade_date=date(2023, 12, 1),
+                ticker="ABC",
+                asset_name="ABC",
+                trade_type="BUY",
+                amount_range="$1,001 - $15,000",
+                source="dummy",
+                source_url=f"https://example.com/{index}",
+                created_at=batches[index // 4],
+            )
+        )
+    session.commit()
+
+    seen: list[int] = []
+    created_after, since_id = datetime(2023, 12, 31), None
+    while True:
+        query = filter_created_after(session.query(Trade), created_after, since_id)
+        page = query.order_by(Trade.created_at.asc(), Trade.id.asc()).limit(3).all()
+        if not page:
+            break
+        seen.extend(trade.id for trade in page)
+        created_after, since_id = page[-1].created_at, page[-1].id
+
+    assert seen == [trade.id for trade in session.query(Trade).order_by(Trade.id).all()]